@@ -0,0 +1,45 @@
+"""Analysis tiers: a fast, cheap quick scan and the full deep analysis.
+
+Each mode routes to its own model, compacts the prompt to its own token
+budget, bounds the model call with its own deadline and is measured
+against its own latency SLO (end-to-end seconds per analysis).
+"""
+from collections import namedtuple
+
+import app_config
+from metrics import metrics
+
+AnalysisMode = namedtuple('AnalysisMode', ['name', 'label', 'model_name', 'token_budget', 'timeout', 'slo_seconds'])
+
+MODES = {
+    'quick': AnalysisMode(
+        'quick', "⚡ Quick Scan", app_config.QUICK_MODEL, app_config.QUICK_TOKEN_BUDGET,
+        app_config.QUICK_TIMEOUT_SECONDS, app_config.QUICK_SLO_SECONDS,
+    ),
+    'deep': AnalysisMode(
+        'deep', "🔬 Deep Analysis", app_config.GEMINI_MODEL, app_config.PROMPT_TOKEN_BUDGET,
+        app_config.LLM_TIMEOUT_SECONDS, app_config.DEEP_SLO_SECONDS,
+    ),
+}
+
+
+def record_latency(mode, seconds, failed=False):
+    """Record one analysis of a mode against that mode's SLO; a failed analysis is a miss"""
+    metrics.record(f'analysis.{mode.name}', seconds)
+    metrics.increment(f'analysis.{mode.name}.count')
+    if failed:
+        metrics.increment(f'analysis.{mode.name}.failed')
+    if failed or seconds > mode.slo_seconds:
+        metrics.increment(f'analysis.{mode.name}.slo_miss')
+
+
+def slo_report(mode):
+    """Latency summary of a mode plus the share of analyses within its SLO, or None"""
+    summary = metrics.summary(f'analysis.{mode.name}')
+    if summary is None:
+        return None
+    total = metrics.count(f'analysis.{mode.name}.count')
+    missed = metrics.count(f'analysis.{mode.name}.slo_miss')
+    summary['slo_seconds'] = mode.slo_seconds
+    summary['within_slo'] = 1.0 - missed / total if total else 1.0
+    return summary
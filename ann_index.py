@@ -0,0 +1,215 @@
+"""Approximate nearest-neighbour index over dense resume vectors.
+
+Random-hyperplane LSH in pure NumPy: every vector gets one ``n_bits`` sign
+code per table, and a query only rescores the vectors sharing a bucket with it
+(or a bucket one bit away, multi-probe) in any table. Storage is append-only
+raw files, memory-mapped on load:
+
+    meta.json   -- dimensions, table layout and hyperplane seed
+    vectors.f32 -- float32 rows (n x dim)
+    codes.u64   -- uint64 bucket codes (n x n_tables)
+    ids.tsv     -- doc_id and name of every row
+
+Vectors come from the LSA projection of the scoring TF-IDF (semantic_model),
+so they live in the same space as the semantic match score.
+"""
+import os
+import json
+import threading
+
+import numpy as np
+
+import app_config
+import semantic_model
+
+PENDING_REBUILD_ROWS = 4096
+
+
+class AnnIndex:
+    """Persistent multi-table LSH index supporting incremental inserts"""
+
+    def __init__(self, directory, dim, n_tables=16, n_bits=12, seed=0):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['dim'] != dim:
+                raise ValueError(f"ANN index holds {meta['dim']}-d vectors, model produces {dim}-d")
+        else:
+            meta = {'dim': dim, 'n_tables': n_tables, 'n_bits': n_bits, 'seed': seed}
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        self.dim = meta['dim']
+        self.n_tables = meta['n_tables']
+        self.n_bits = meta['n_bits']
+        rng = np.random.default_rng(meta['seed'])
+        self._planes = rng.standard_normal((self.n_tables, self.n_bits, self.dim)).astype(np.float32)
+        self._bit_values = (np.uint64(1) << np.arange(self.n_bits, dtype=np.uint64))
+        self._load()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        self.ids = []
+        self.names = []
+        if os.path.exists(self._path('ids.tsv')):
+            with open(self._path('ids.tsv'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    doc_id, _, name = line.rstrip('\n').partition('\t')
+                    self.ids.append(doc_id)
+                    self.names.append(name)
+        count = len(self.ids)
+        self._id_set = set(self.ids)
+        self._vectors = self._map('vectors.f32', np.float32, (count, self.dim))
+        codes = self._map('codes.u64', np.uint64, (count, self.n_tables))
+        # Per table: codes sorted once, so bucket lookups are binary searches
+        self._order = [np.argsort(codes[:, t], kind='stable') for t in range(self.n_tables)]
+        self._sorted_codes = [codes[self._order[t], t] for t in range(self.n_tables)]
+        self._base_count = count
+        self._pending_vectors = []
+        self._pending_buckets = [{} for _ in range(self.n_tables)]
+
+    def _map(self, name, dtype, shape):
+        if shape[0] == 0:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self._path(name), dtype=dtype, mode='r', shape=shape)
+
+    def _codes(self, vectors):
+        """(n, n_tables) uint64 bucket codes of unit vectors"""
+        bits = np.einsum('tbd,nd->ntb', self._planes, vectors) > 0
+        return (bits.astype(np.uint64) * self._bit_values).sum(axis=2, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, doc_ids, names, vectors):
+        """Append unit vectors; ids already in the index are skipped"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock:
+            keep = [i for i, doc_id in enumerate(doc_ids) if doc_id not in self._id_set]
+            if not keep:
+                return 0
+            vectors = vectors[keep]
+            codes = self._codes(vectors)
+            with open(self._path('vectors.f32'), 'ab') as f:
+                f.write(vectors.tobytes())
+            with open(self._path('codes.u64'), 'ab') as f:
+                f.write(codes.tobytes())
+            with open(self._path('ids.tsv'), 'a', encoding='utf-8') as f:
+                for i in keep:
+                    name = names[i].replace('\t', ' ').replace('\n', ' ')
+                    f.write(f"{doc_ids[i]}\t{name}\n")
+
+            for row, i in enumerate(keep):
+                position = len(self.ids)
+                self.ids.append(doc_ids[i])
+                self.names.append(names[i])
+                self._id_set.add(doc_ids[i])
+                self._pending_vectors.append(vectors[row])
+                for t in range(self.n_tables):
+                    self._pending_buckets[t].setdefault(int(codes[row, t]), []).append(position)
+            # Fold in-memory inserts back into the sorted, memory-mapped tables
+            if len(self._pending_vectors) >= PENDING_REBUILD_ROWS:
+                self._load()
+            return len(keep)
+
+    def _probe_codes(self, code):
+        flips = np.uint64(code) ^ self._bit_values
+        return np.concatenate(([np.uint64(code)], flips))
+
+    def _candidates(self, query_codes, probes):
+        found = []
+        for t in range(self.n_tables):
+            probe = self._probe_codes(query_codes[t]) if probes else np.array([query_codes[t]], dtype=np.uint64)
+            sorted_codes = self._sorted_codes[t]
+            if len(sorted_codes):
+                lo = np.searchsorted(sorted_codes, probe, side='left')
+                hi = np.searchsorted(sorted_codes, probe, side='right')
+                for start, stop in zip(lo, hi):
+                    if stop > start:
+                        found.append(self._order[t][start:stop])
+            pending = self._pending_buckets[t]
+            if pending:
+                for code in probe:
+                    rows = pending.get(int(code))
+                    if rows:
+                        found.append(np.asarray(rows))
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def _rows(self, rows):
+        base = rows[rows < self._base_count]
+        extra = rows[rows >= self._base_count] - self._base_count
+        parts = []
+        if len(base):
+            parts.append(np.asarray(self._vectors[base]))
+        if len(extra):
+            parts.append(np.stack([self._pending_vectors[i] for i in extra]))
+        return np.concatenate(parts) if parts else np.zeros((0, self.dim), dtype=np.float32)
+
+    def search(self, vector, k=10, probes=True):
+        """Approximate top-k by cosine: [(doc_id, name, score), ...]"""
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        with self._lock:
+            query_codes = self._codes(vector)[0]
+            rows = self._candidates(query_codes, probes)
+            if not len(rows):
+                return []
+            scores = self._rows(rows) @ vector[0]
+            top = np.argsort(-scores, kind='stable')[:k]
+            return [(self.ids[rows[i]], self.names[rows[i]], float(scores[i])) for i in top]
+
+    def brute_force(self, vector, k=10):
+        """Exact top-k by scanning every vector (reference for benchmarks)"""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            rows = np.arange(len(self.ids))
+            if not len(rows):
+                return []
+            scores = self._rows(rows) @ vector
+            top = np.argsort(-scores, kind='stable')[:k]
+            return [(self.ids[i], self.names[i], float(scores[i])) for i in top]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ann_index():
+    """Process-wide ANN index, or None when there is no LSA model to embed with"""
+    global _index
+    if not app_config.RESUME_INDEX_ENABLED:
+        return None
+    model = semantic_model.get_semantic_model()
+    if model is None:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = AnnIndex(os.path.join(app_config.CACHE_DIR, 'ann'), model.projection.shape[0],
+                                  n_tables=app_config.ANN_TABLES, n_bits=app_config.ANN_BITS)
+    return _index
+
+
+def add_documents(doc_ids, names, documents):
+    """Embed documents (texts or AnalyzedTexts) and add them to the ANN index"""
+    index = get_ann_index()
+    if index is None or not documents:
+        return 0
+    vectors = semantic_model.get_semantic_model().embed(documents)
+    return index.add(doc_ids, names, vectors)
+
+
+def search(jd, k=10):
+    """Semantically closest stored resumes to a job description, or None without a model"""
+    index = get_ann_index()
+    if index is None:
+        return None
+    vector = semantic_model.get_semantic_model().embed([jd])[0]
+    return index.search(vector, k=k)
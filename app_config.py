@@ -0,0 +1,97 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Local storage used by the performance layers (caches, indexes, models)
+CACHE_DIR = os.getenv('ATS_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+
+# Extraction cache
+EXTRACTION_CACHE_MEMORY_ITEMS = int(os.getenv('EXTRACTION_CACHE_MEMORY_ITEMS', '128'))
+EXTRACTION_CACHE_DISK_BYTES = int(os.getenv('EXTRACTION_CACHE_DISK_MB', '256')) * 1024 * 1024
+
+# PDF extraction: documents with at least this many pages are split across a process pool
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '8'))
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# OCR: number of warm OCR workers shared by all sessions
+OCR_POOL_SIZE = int(os.getenv('OCR_POOL_SIZE', '2'))
+OCR_LANG = os.getenv('OCR_LANG', 'eng')
+
+# Image preprocessing applied before OCR
+OCR_TARGET_DPI = int(os.getenv('OCR_TARGET_DPI', '300'))
+OCR_GRAYSCALE = os.getenv('OCR_GRAYSCALE', 'true').lower() == 'true'
+OCR_BINARIZE = os.getenv('OCR_BINARIZE', 'true').lower() == 'true'
+OCR_DESKEW = os.getenv('OCR_DESKEW', 'false').lower() == 'true'
+
+# Scanned PDFs: pages with less text than this are rasterized and OCRed
+PDF_OCR_FALLBACK = os.getenv('PDF_OCR_FALLBACK', 'true').lower() == 'true'
+PDF_MIN_TEXT_CHARS = int(os.getenv('PDF_MIN_TEXT_CHARS', '20'))
+
+# Offline-built scoring models (IDF table, LSA projection)
+MODEL_DIR = os.getenv('ATS_MODEL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models'))
+
+# Shared resume library for recruiter deployments: every uploaded resume is indexed and
+# any user of the server can search it (names and scores), so it is off by default
+RESUME_INDEX_ENABLED = os.getenv('RESUME_INDEX_ENABLED', 'false').lower() == 'true'
+RESUME_INDEX_PATH = os.getenv('RESUME_INDEX_PATH', os.path.join(CACHE_DIR, 'resume_index.sqlite3'))
+
+# Skill dictionary (canonical names + aliases) used for missing-keyword analysis
+SKILLS_DICTIONARY_PATH = os.getenv('SKILLS_DICTIONARY_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.json'))
+
+# Semantic (LSA) ANN index over stored resumes: LSH tables x bits per code
+ANN_TABLES = int(os.getenv('ANN_TABLES', '16'))
+ANN_BITS = int(os.getenv('ANN_BITS', '12'))
+
+# Near-duplicate resume detection (MinHash signatures, LSH bands)
+NEAR_DUPLICATE_DETECTION = os.getenv('NEAR_DUPLICATE_DETECTION', 'true').lower() == 'true'
+NEAR_DUPLICATE_INDEX_PATH = os.getenv('NEAR_DUPLICATE_INDEX_PATH', os.path.join(CACHE_DIR, 'near_duplicates.sqlite3'))
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.85'))
+MINHASH_PERMUTATIONS = int(os.getenv('MINHASH_PERMUTATIONS', '128'))
+MINHASH_BANDS = int(os.getenv('MINHASH_BANDS', '16'))
+
+# Language model used for the written analysis
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-pro')
+
+# Model backend: 'gemini', or 'stub' for offline load tests with injected latency and errors
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini').lower()
+LLM_STUB_LATENCY_SECONDS = float(os.getenv('LLM_STUB_LATENCY_SECONDS', '1.5'))
+LLM_STUB_LATENCY_SIGMA = float(os.getenv('LLM_STUB_LATENCY_SIGMA', '0.5'))
+LLM_STUB_CHUNK_DELAY_SECONDS = float(os.getenv('LLM_STUB_CHUNK_DELAY_SECONDS', '0.05'))
+LLM_STUB_CHUNK_WORDS = int(os.getenv('LLM_STUB_CHUNK_WORDS', '12'))
+LLM_STUB_ERROR_RATE = float(os.getenv('LLM_STUB_ERROR_RATE', '0'))
+
+# Persistent cache of model responses (SQLite, zlib-compressed)
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', os.path.join(CACHE_DIR, 'responses.sqlite3'))
+RESPONSE_CACHE_TTL_SECONDS = int(float(os.getenv('RESPONSE_CACHE_TTL_HOURS', '168')) * 3600)
+RESPONSE_CACHE_BYTES = int(os.getenv('RESPONSE_CACHE_MB', '64')) * 1024 * 1024
+
+# Stream the written analysis chunk by chunk instead of waiting for the full response
+LLM_STREAMING = os.getenv('LLM_STREAMING', 'true').lower() == 'true'
+
+# Process-wide model call limits shared by every session
+LLM_REQUESTS_PER_MINUTE = int(os.getenv('LLM_REQUESTS_PER_MINUTE', '60'))
+LLM_TOKENS_PER_MINUTE = int(os.getenv('LLM_TOKENS_PER_MINUTE', '1000000'))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '4'))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '4'))
+LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', '120'))
+# Expected response length, charged against the tokens-per-minute budget up front
+LLM_OUTPUT_TOKENS = int(os.getenv('LLM_OUTPUT_TOKENS', '1024'))
+
+# Prompt compaction: clean both inputs and fit them into this many (estimated) tokens
+PROMPT_COMPACTION = os.getenv('PROMPT_COMPACTION', 'true').lower() == 'true'
+PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '6000'))
+
+# Request the analysis sections concurrently instead of in one long generation
+LLM_SECTION_FANOUT = os.getenv('LLM_SECTION_FANOUT', 'false').lower() == 'true'
+
+# Analysis tiers: quick scan (fast model, small prompt, tight deadline) vs deep analysis
+QUICK_MODEL = os.getenv('QUICK_MODEL', 'gemini-1.5-flash')
+QUICK_TOKEN_BUDGET = int(os.getenv('QUICK_TOKEN_BUDGET', '2000'))
+QUICK_TIMEOUT_SECONDS = float(os.getenv('QUICK_TIMEOUT_SECONDS', '15'))
+QUICK_SLO_SECONDS = float(os.getenv('QUICK_SLO_SECONDS', '5'))
+DEEP_SLO_SECONDS = float(os.getenv('DEEP_SLO_SECONDS', '45'))
+
+# Ask the model for the deep analysis as schema-validated JSON instead of free text
+STRUCTURED_OUTPUT = os.getenv('STRUCTURED_OUTPUT', 'false').lower() == 'true'
@@ -0,0 +1,81 @@
+import io
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+import scoring_model
+import semantic_model
+
+EXTENSION_KINDS = {
+    '.pdf': 'pdf',
+    '.docx': 'docx',
+    '.png': 'image',
+    '.jpg': 'image',
+    '.jpeg': 'image',
+}
+
+# Guard rails for uploaded archives
+MAX_ZIP_MEMBERS = 1000
+MAX_ZIP_MEMBER_BYTES = 20 * 1024 * 1024
+
+
+def resume_kind(filename):
+    """Extractor kind ('pdf', 'docx', 'image') for a filename, or None"""
+    return EXTENSION_KINDS.get(os.path.splitext(filename)[1].lower())
+
+
+def _iter_zip(upload):
+    with zipfile.ZipFile(upload) as archive:
+        members = [info for info in archive.infolist() if not info.is_dir()]
+        for info in members[:MAX_ZIP_MEMBERS]:
+            basename = os.path.basename(info.filename)
+            if info.filename.startswith('__MACOSX/') or basename.startswith('.'):
+                continue
+            if resume_kind(basename) is None or info.file_size > MAX_ZIP_MEMBER_BYTES:
+                continue
+            buffer = io.BytesIO(archive.read(info))
+            buffer.name = info.filename
+            yield info.filename, buffer
+
+
+def iter_resume_files(uploads):
+    """Yield (name, file) for every supported resume, expanding zip archives"""
+    for upload in uploads:
+        if upload.name.lower().endswith('.zip'):
+            yield from _iter_zip(upload)
+        elif resume_kind(upload.name) is not None:
+            yield upload.name, upload
+
+
+def score_resumes(jd, documents):
+    """Lexical and semantic scores of every resume (text or AnalyzedText) against the JD
+
+    All documents are vectorized into one sparse matrix; the lexical cosine is
+    a single sparse product and the semantic score a single LSA projection.
+    The semantic scores are None when no LSA model is available.
+    """
+    if not documents:
+        return np.zeros(0), None
+    matrix = scoring_model.get_scoring_model().transform([jd] + list(documents))
+    # Rows are L2-normalised, so the dot product is the cosine similarity
+    lexical = np.asarray((matrix[1:] @ matrix[0].T).todense()).ravel()
+    lsa = semantic_model.get_semantic_model()
+    semantic = lsa.scores_from_tfidf(matrix) if lsa is not None else None
+    return lexical, semantic
+
+
+def rank_resumes(jd, documents):
+    """Rank (name, document) pairs against a job description, best match first"""
+    names = [name for name, _ in documents]
+    scores, semantic = score_resumes(jd, [document for _, document in documents])
+    order = np.argsort(-scores, kind='stable')
+    ranking = pd.DataFrame({
+        'Rank': np.arange(1, len(order) + 1),
+        'Resume': [names[i] for i in order],
+        'Match Score (%)': np.round(scores[order] * 100, 2),
+    })
+    if semantic is not None:
+        ranking['Semantic Score (%)'] = np.round(semantic[order].astype(np.float64) * 100, 2)
+    return ranking
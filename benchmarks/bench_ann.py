@@ -0,0 +1,79 @@
+"""LSH approximate nearest-neighbour search vs an exact scan.
+
+Usage:
+    python benchmarks/bench_ann.py                    # 100k synthetic 128-d vectors
+    python benchmarks/bench_ann.py --rows 20000 --tables 12 --bits 14 --spread 1.0
+
+Vectors are clustered unit vectors, like LSA embeddings of resumes from a
+handful of professions. Reports build time, mean query latency of both
+searches and recall@k of the approximate results against the exact ones.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ann_index import AnnIndex
+
+
+def clustered_vectors(rows, centres, spread, rng):
+    clusters, dim = centres.shape
+    labels = rng.integers(0, clusters, size=rows)
+    vectors = centres[labels] + spread * rng.standard_normal((rows, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def timed(func, queries):
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        results.append(func(query))
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    centres = rng.standard_normal((args.clusters, args.dim))
+    vectors = clustered_vectors(args.rows, centres, args.spread, rng)
+    queries = clustered_vectors(args.queries, centres, args.spread, rng)
+    with tempfile.TemporaryDirectory() as directory:
+        index = AnnIndex(directory, args.dim, n_tables=args.tables, n_bits=args.bits)
+        ids = [str(i) for i in range(args.rows)]
+        start = time.perf_counter()
+        for offset in range(0, args.rows, 10000):
+            index.add(ids[offset:offset + 10000], ids[offset:offset + 10000], vectors[offset:offset + 10000])
+        index = AnnIndex(directory, args.dim)  # reopen: memory-mapped, sorted tables
+        build = time.perf_counter() - start
+
+        exact, exact_ms = timed(lambda q: index.brute_force(q, k=args.k), queries)
+        approx, approx_ms = timed(lambda q: index.search(q, k=args.k), queries)
+        recall = np.mean([
+            len({doc_id for doc_id, _, _ in a} & {doc_id for doc_id, _, _ in e}) / args.k
+            for a, e in zip(approx, exact)
+        ])
+
+    print(f"{args.rows} vectors x {args.dim}d, {args.tables} tables x {args.bits} bits, build {build:.2f}s")
+    print(f"{'search':<12}{'ms/query':>10}{f'recall@{args.k}':>12}")
+    print(f"{'exact':<12}{exact_ms * 1000:>10.2f}{1.0:>12.3f}")
+    print(f"{'lsh':<12}{approx_ms * 1000:>10.2f}{recall:>12.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=128)
+    parser.add_argument('--clusters', type=int, default=200)
+    parser.add_argument('--spread', type=float, default=0.6)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--tables', type=int, default=16)
+    parser.add_argument('--bits', type=int, default=12)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    run(args)
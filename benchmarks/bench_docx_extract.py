@@ -0,0 +1,80 @@
+"""Streaming DOCX extractor vs the python-docx route.
+
+Usage:
+    python benchmarks/bench_docx_extract.py                 # synthetic table-heavy template
+    python benchmarks/bench_docx_extract.py resume.docx ... # your own files
+
+Reports wall time, peak Python heap (tracemalloc) and characters extracted.
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+
+from docx_stream import extract_docx_text, extract_docx_text_compat
+
+
+def build_template(tables, rows, cols):
+    """Build a resume-like document dominated by skills/experience tables"""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = 'Jane Doe | Senior Data Engineer'
+    doc.add_heading('Professional Summary', level=1)
+    doc.add_paragraph('Data engineer with experience building streaming pipelines on AWS and GCP. ' * 5)
+    for t in range(tables):
+        doc.add_heading(f'Section {t}', level=2)
+        table = doc.add_table(rows=rows, cols=cols)
+        for r, row in enumerate(table.rows):
+            for c, cell in enumerate(row.cells):
+                cell.text = f'Python SQL Spark Kafka Airflow {t}-{r}-{c}'
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(func, data, repeat):
+    best = float('inf')
+    peak = 0
+    text = ''
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        text = func(io.BytesIO(data))
+        elapsed = time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        best = min(best, elapsed)
+    return best, peak, len(text)
+
+
+def run(documents, repeat):
+    print(f"{'document':<32}{'extractor':<12}{'ms':>10}{'peak MB':>10}{'chars':>10}")
+    for name, data in documents:
+        for label, func in (('streaming', extract_docx_text), ('python-docx', extract_docx_text_compat)):
+            elapsed, peak, chars = measure(func, data, repeat)
+            print(f"{name:<32}{label:<12}{elapsed * 1000:>10.1f}{peak / 1e6:>10.2f}{chars:>10}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--tables', type=int, default=40)
+    parser.add_argument('--rows', type=int, default=25)
+    parser.add_argument('--cols', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.files:
+        documents = []
+        for path in args.files:
+            with open(path, 'rb') as f:
+                documents.append((os.path.basename(path), f.read()))
+    else:
+        label = f'synthetic {args.tables}x{args.rows}x{args.cols}'
+        documents = [(label, build_template(args.tables, args.rows, args.cols))]
+    run(documents, args.repeat)
@@ -0,0 +1,96 @@
+"""Throughput of the model client against the offline stub backend.
+
+Usage:
+    python benchmarks/bench_llm_throughput.py
+    python benchmarks/bench_llm_throughput.py --requests 200 --concurrency 4 8 16 --rpm 120 --error-rate 0.05
+
+Every request is a distinct prompt sent through llm_client.AsyncLLMClient
+(rate limiter, concurrency cap, retries) to a StubBackend with lognormal
+latency. Reports requests/second, latency percentiles, time to first chunk,
+failures and retries per concurrency level, without network access or quota.
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_backends import StubBackend
+from llm_client import AsyncLLMClient
+from metrics import metrics
+
+
+def run_level(backend, concurrency, args):
+    client = AsyncLLMClient(requests_per_minute=args.rpm, tokens_per_minute=args.tpm,
+                            max_concurrency=concurrency, max_retries=args.retries, base_delay=0.2)
+    retries_before = metrics.count('llm.retries')
+    latencies = []
+    first_chunks = []
+    failures = 0
+    lock = threading.Lock()
+
+    def submit(i):
+        started = time.perf_counter()
+        first = []
+
+        def on_chunk(text):
+            if not first:
+                first.append(time.perf_counter() - started)
+
+        future = client.submit(backend, f"Resume {i}\nJob description {i}", stream=True, on_chunk=on_chunk,
+                               deadline=time.monotonic() + args.timeout)
+
+        def done(f):
+            nonlocal failures
+            with lock:
+                if f.exception() is not None:
+                    failures += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+                    first_chunks.extend(first)
+        future.add_done_callback(done)
+        return future
+
+    start = time.perf_counter()
+    futures = [submit(i) for i in range(args.requests)]
+    for future in futures:
+        try:
+            future.result()
+        except Exception:
+            pass
+    elapsed = time.perf_counter() - start
+    time.sleep(0.05)  # let done-callbacks settle
+
+    latencies = np.array(latencies) if latencies else np.zeros(1)
+    first_chunks = np.array(first_chunks) if first_chunks else np.zeros(1)
+    print(f"{concurrency:>6}{args.requests / elapsed:>10.2f}{np.percentile(latencies, 50):>9.2f}"
+          f"{np.percentile(latencies, 95):>9.2f}{np.percentile(first_chunks, 50):>10.2f}"
+          f"{failures:>8}{metrics.count('llm.retries') - retries_before:>9}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=64)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--latency', type=float, default=1.0, help='median seconds before the first chunk')
+    parser.add_argument('--sigma', type=float, default=0.5, help='lognormal sigma of that latency')
+    parser.add_argument('--chunk-delay', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rpm', type=int, default=100000)
+    parser.add_argument('--tpm', type=int, default=100000000)
+    parser.add_argument('--retries', type=int, default=4)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    backend = StubBackend(latency_median=args.latency, latency_sigma=args.sigma, chunk_delay=args.chunk_delay,
+                          error_rate=args.error_rate, seed=args.seed)
+    print(f"{args.requests} requests, stub latency p50 {args.latency}s (sigma {args.sigma}), "
+          f"error rate {args.error_rate}, {args.rpm} rpm")
+    print(f"{'conc':>6}{'req/s':>10}{'p50 s':>9}{'p95 s':>9}{'ttfc s':>10}{'failed':>8}{'retries':>9}")
+    for concurrency in args.concurrency:
+        run_level(backend, concurrency, args)
@@ -0,0 +1,75 @@
+"""Latency / accuracy tradeoff of the OCR preprocessing settings.
+
+Usage:
+    python benchmarks/bench_ocr_preprocess.py resume1.jpg resume2.png ...
+
+If a ``<image>.txt`` file sits next to an image it is used as ground truth;
+otherwise accuracy is reported relative to the unprocessed OCR output.
+"""
+import os
+import sys
+import time
+import argparse
+import difflib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from image_preprocess import preprocess_image
+from ocr_engine import ocr_engine
+
+SETTINGS = [
+    ('none', dict(target_dpi=0, grayscale=False, binarize=False, deskew=False)),
+    ('downscale', dict(target_dpi=300, grayscale=False, binarize=False, deskew=False)),
+    ('downscale+gray', dict(target_dpi=300, grayscale=True, binarize=False, deskew=False)),
+    ('downscale+gray+binarize', dict(target_dpi=300, grayscale=True, binarize=True, deskew=False)),
+    ('all+deskew', dict(target_dpi=300, grayscale=True, binarize=True, deskew=True)),
+    ('200dpi+gray+binarize', dict(target_dpi=200, grayscale=True, binarize=True, deskew=False)),
+]
+
+
+def similarity(a, b):
+    return difflib.SequenceMatcher(None, ' '.join(a.split()), ' '.join(b.split()), autojunk=False).ratio()
+
+
+def run(paths, repeat):
+    results = {name: {'prep': 0.0, 'ocr': 0.0, 'pixels': 0, 'accuracy': 0.0} for name, _ in SETTINGS}
+    for path in paths:
+        truth_path = os.path.splitext(path)[0] + '.txt'
+        truth = None
+        if os.path.exists(truth_path):
+            with open(truth_path, encoding='utf-8') as f:
+                truth = f.read()
+
+        for name, options in SETTINGS:
+            text = ''
+            for _ in range(repeat):
+                start = time.perf_counter()
+                image = preprocess_image(Image.open(path), **options)
+                image.load()
+                prepared = time.perf_counter()
+                text = ocr_engine.image_to_string(image)
+                finished = time.perf_counter()
+                results[name]['prep'] += prepared - start
+                results[name]['ocr'] += finished - prepared
+            results[name]['pixels'] += image.width * image.height
+            if truth is None:
+                truth = text  # first setting ('none') is the reference
+            results[name]['accuracy'] += similarity(text, truth)
+
+    runs = len(paths) * repeat
+    print(f"OCR backend: {ocr_engine.backend}, images: {len(paths)}, repeat: {repeat}")
+    print(f"{'setting':<26}{'prep ms':>10}{'ocr ms':>10}{'Mpixels':>10}{'accuracy':>10}")
+    for name, _ in SETTINGS:
+        r = results[name]
+        print(f"{name:<26}{r['prep'] / runs * 1000:>10.1f}{r['ocr'] / runs * 1000:>10.1f}"
+              f"{r['pixels'] / len(paths) / 1e6:>10.2f}{r['accuracy'] / len(paths):>10.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('images', nargs='+')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.images, args.repeat)
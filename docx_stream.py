@@ -0,0 +1,94 @@
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+from docx import Document
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_NS = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+_HEADER_PATTERN = re.compile(r'^word/header\d*\.xml$')
+_FOOTER_PATTERN = re.compile(r'^word/footer\d*\.xml$')
+
+
+def _part_order(names):
+    """Headers, then the document body, then footers"""
+    headers = sorted(name for name in names if _HEADER_PATTERN.match(name))
+    footers = sorted(name for name in names if _FOOTER_PATTERN.match(name))
+    return headers + ['word/document.xml'] + footers
+
+
+def iter_part_text(stream):
+    """Yield text fragments of one WordprocessingML part in document order
+
+    Paragraphs end with a newline, table cells are tab-separated and rows end
+    with a newline. Tab stops in paragraph properties are ignored. Text boxes are read from their primary representation;
+    the VML copy in ``mc:Fallback`` is skipped so it is not emitted twice.
+    Processed elements are cleared as parsing goes, keeping memory bounded.
+    """
+    skip_depth = 0
+    cell_depth = 0
+    properties_depth = 0
+    container = None
+    depth = 0
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            depth += 1
+            if tag == MC_NS + 'Fallback':
+                skip_depth += 1
+            elif tag == W_NS + 'tc':
+                cell_depth += 1
+            elif tag == W_NS + 'pPr':
+                properties_depth += 1
+            elif container is None and tag in (W_NS + 'body', W_NS + 'hdr', W_NS + 'ftr'):
+                container = (elem, depth)
+            continue
+
+        depth -= 1
+        if tag == W_NS + 'tc':
+            cell_depth -= 1
+        elif tag == W_NS + 'pPr':
+            properties_depth -= 1
+        if tag == MC_NS + 'Fallback':
+            skip_depth -= 1
+        elif skip_depth:
+            pass
+        elif tag == W_NS + 't':
+            if elem.text:
+                yield elem.text
+        elif tag == W_NS + 'tab' and not properties_depth:
+            yield '\t'
+        elif tag in (W_NS + 'br', W_NS + 'cr'):
+            yield '\n'
+        elif tag == W_NS + 'p':
+            yield ' ' if cell_depth else '\n'
+        elif tag == W_NS + 'tc':
+            yield '\t'
+        elif tag == W_NS + 'tr':
+            yield '\n'
+
+        # Drop finished top-level blocks so the tree never holds the whole part
+        if container is not None and depth == container[1]:
+            container[0].clear()
+
+
+def extract_docx_text(file):
+    """Stream text from a DOCX straight out of the zip: headers, body (paragraphs,
+    tables, text boxes) and footers"""
+    pieces = []
+    with zipfile.ZipFile(file) as archive:
+        names = set(archive.namelist())
+        for name in _part_order(names):
+            if name not in names:
+                continue
+            with archive.open(name) as stream:
+                pieces.extend(iter_part_text(stream))
+            pieces.append('\n')
+    return ''.join(pieces)
+
+
+def extract_docx_text_compat(file):
+    """python-docx route: body paragraphs only, as the extractor originally worked"""
+    doc = Document(file)
+    return ''.join(para.text + "\n" for para in doc.paragraphs)
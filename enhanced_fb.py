@@ -1,15 +1,11 @@
 import os
 import streamlit as st
+import app_config
 from dotenv import load_dotenv
 from streamlit_extras import add_vertical_space as avs
-import google.generativeai as genai
-from PyPDF2 import PdfReader
-from docx import Document
 from PIL import Image
 import pytesseract
 import base64
-from sklearn.feature_extraction.text import TfidfVectorizer
-from google.api_core.exceptions import InvalidArgument
 import login
 import signup
 import platform
@@ -18,12 +14,32 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 from firebase_config import firebaseConfig, firebase, auth, db
+from extraction_cache import cached_extraction
+from pdf_engine import extract_pdf_text
+from docx_stream import extract_docx_text, extract_docx_text_compat
+from ocr_engine import ocr_engine
+from image_preprocess import preprocess_image
+import scoring_model
+import batch_scoring
+import resume_index
+import keyword_ranking
+import semantic_model
+import ann_index
+import near_duplicates
+import response_cache
+import llm_client
+import llm_backends
+from metrics import metrics
+import prompts
+import prompt_compaction
+import analysis_modes
+import structured_analysis
+from text_processing import analyze_text
 import time
 import json
+import uuid
 
 load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-model = genai.GenerativeModel('gemini-pro')
 
 # Configure tesseract path based on OS
 tesseract_path = shutil.which('tesseract')
@@ -39,61 +55,49 @@ elif platform.system() == 'Windows':
             pytesseract.pytesseract.tesseract_cmd = path
             break
 
+@cached_extraction('pdf')
 def extract_text_from_pdf(file):
     """Extract text from PDF file with enhanced error handling"""
     try:
-        reader = PdfReader(file)
-        extracted_text = ""
-        for page in reader.pages:
-            extracted_text += page.extract_text()
-        return extracted_text
+        return extract_pdf_text(file)
     except Exception as e:
         st.error(f"Error reading PDF: {str(e)}")
         return ""
 
+@cached_extraction('docx')
 def extract_text_from_docx(file):
     """Extract text from DOCX file with enhanced error handling"""
     try:
-        doc = Document(file)
-        extracted_text = ""
-        for para in doc.paragraphs:
-            extracted_text += para.text + "\n"
-        return extracted_text
+        return extract_docx_text(file)
+    except Exception as e:
+        print(f"Streaming DOCX extraction failed, falling back to python-docx: {e}")
+    try:
+        file.seek(0)
+        return extract_docx_text_compat(file)
     except Exception as e:
         st.error(f"Error reading DOCX: {str(e)}")
         return ""
 
+@cached_extraction('image')
 def extract_text_from_image(file):
     """Extract text from image using OCR with enhanced error handling"""
     try:
-        image = Image.open(file)
-        extracted_text = pytesseract.image_to_string(image)
+        image = preprocess_image(Image.open(file))
+        extracted_text = ocr_engine.image_to_string(image)
         return extracted_text
     except Exception as e:
         st.error(f"Error performing OCR: {str(e)}. Please ensure Tesseract is installed.")
         return ""
 
 def calculate_match_percentage(jd, resume):
-    """Calculate match percentage using TF-IDF similarity"""
+    """Calculate match percentage using TF-IDF similarity against the pre-fitted IDF model.
+    Accepts raw text or documents already analyzed by text_processing."""
     try:
-        vectorizer = TfidfVectorizer(stop_words='english', lowercase=True)
-        vectors = vectorizer.fit_transform([jd, resume])
-        
-        # Calculate cosine similarity
-        from sklearn.metrics.pairwise import cosine_similarity
-        similarity = cosine_similarity(vectors[0:1], vectors[1:2])
-        return round(similarity[0][0] * 100, 2)
+        return round(scoring_model.similarity(jd, resume) * 100, 2)
     except Exception as e:
         st.error(f"Error calculating match: {str(e)}")
         return 0
 
-def find_missing_keywords(jd, resume):
-    """Find missing keywords with better analysis"""
-    jd_words = set(word.lower().strip() for word in jd.split() if len(word) > 3)
-    resume_words = set(word.lower().strip() for word in resume.split() if len(word) > 3)
-    missing_keywords = jd_words - resume_words
-    return list(missing_keywords)[:10]  # Top 10 missing keywords
-
 def create_progress_circle(percentage):
     """Create an interactive progress circle using Plotly"""
     fig = go.Figure(go.Indicator(
@@ -127,20 +131,26 @@ def create_progress_circle(percentage):
     )
     return fig
 
-def create_keyword_chart(missing_keywords):
-    """Create a bar chart for missing keywords"""
+def create_keyword_chart(missing_keywords, keyword_weights=None):
+    """Create a bar chart for missing keywords, sized by their importance weights"""
     if not missing_keywords:
         return None
     
-    # Create importance scores for visualization
-    importance_scores = list(range(len(missing_keywords), 0, -1))
+    missing_keywords = missing_keywords[:10]
+    x_label = keyword_ranking.weight_label() if keyword_weights else None
+    if x_label:
+        importance_scores = [keyword_weights[keyword] for keyword in missing_keywords]
+    else:
+        # Weights that do not follow the ranking order would contradict it; plot the rank
+        importance_scores = list(range(len(missing_keywords), 0, -1))
+        x_label = 'Priority (missing skills first)' if keyword_weights else 'Priority Score'
     
     fig = px.bar(
         x=importance_scores,
-        y=missing_keywords[:10],
+        y=missing_keywords,
         orientation='h',
         title='Top Missing Keywords',
-        labels={'x': 'Priority Score', 'y': 'Keywords'}
+        labels={'x': x_label, 'y': 'Keywords'}
     )
     
     fig.update_layout(
@@ -152,8 +162,259 @@ def create_keyword_chart(missing_keywords):
     
     return fig
 
-def save_analysis_history(user_email, jd, filename, match_percentage, missing_keywords):
-    """Save analysis to user history (if Firebase is available)"""
+EXTRACTORS = {
+    'pdf': extract_text_from_pdf,
+    'docx': extract_text_from_docx,
+    'image': extract_text_from_image,
+}
+
+def run_batch_ranking(jd, uploads):
+    """Extract every uploaded resume and rank them all against one job description"""
+    resume_files = list(batch_scoring.iter_resume_files(uploads))
+    if not resume_files:
+        st.error("❌ No supported resume files found in the upload.")
+        return
+    
+    documents = []
+    failed = []
+    progress = st.progress(0.0, text="📄 Extracting resumes...")
+    for i, (name, file) in enumerate(resume_files):
+        text = EXTRACTORS[batch_scoring.resume_kind(name)](file)
+        if text.strip():
+            document = analyze_text(text)
+            documents.append((name, document))
+            resume_index.index_resume(document, name)
+        else:
+            failed.append(name)
+        progress.progress((i + 1) / len(resume_files), text=f"📄 Extracted {i + 1}/{len(resume_files)}: {name}")
+    progress.empty()
+    
+    if not documents:
+        st.error("❌ Could not extract text from any of the uploaded files.")
+        return
+    
+    # Repeat submissions with small edits are scored once, under their first upload
+    documents, duplicates = near_duplicates.collapse_duplicates(
+        documents, threshold=app_config.NEAR_DUPLICATE_THRESHOLD,
+        num_perm=app_config.MINHASH_PERMUTATIONS, bands=app_config.MINHASH_BANDS
+    )
+    ranking = batch_scoring.rank_resumes(jd, documents)
+    
+    st.markdown("---")
+    st.markdown("## 🏆 Batch Ranking Results")
+    st.metric("📚 Resumes Ranked", len(ranking))
+    st.dataframe(ranking, use_container_width=True, hide_index=True)
+    if duplicates:
+        with st.expander(f"♻️ {len(duplicates)} near-duplicate submission(s) collapsed", expanded=False):
+            st.dataframe(pd.DataFrame({
+                'Resume': [name for name, _, _ in duplicates],
+                'Duplicate Of': [original for _, original, _ in duplicates],
+                'Similarity (%)': [round(similarity * 100, 1) for _, _, similarity in duplicates],
+            }), use_container_width=True, hide_index=True)
+    if failed:
+        st.warning(f"⚠️ No text could be extracted from: {', '.join(failed)}")
+    
+    st.download_button(
+        label="📥 Download Ranking (CSV)",
+        data=ranking.to_csv(index=False),
+        file_name=f"ats_ranking_{int(time.time())}.csv",
+        mime="text/csv"
+    )
+
+def current_owner():
+    """Owner of the resumes stored for this session: the signed-in user, else the session itself"""
+    if st.session_state.get('user_email'):
+        return st.session_state.user_email
+    if 'anonymous_owner' not in st.session_state:
+        st.session_state.anonymous_owner = f"session:{uuid.uuid4().hex}"
+    return st.session_state.anonymous_owner
+
+def find_near_duplicate(resume_doc, name, jd, owner):
+    """Record a resume and look up an earlier near-duplicate of it among the owner's resumes
+
+    Returns (doc_id, duplicate, previous_result): the resume's id, the closest
+    earlier (doc_id, name, jaccard) or None, and the stored analysis of that
+    duplicate against the same job description or None.
+    """
+    index = near_duplicates.get_duplicate_index()
+    if index is None:
+        return None, None, None
+    try:
+        signature = index.signature(resume_doc)
+        matches = index.find(resume_doc, owner, threshold=app_config.NEAR_DUPLICATE_THRESHOLD, signature=signature)
+        doc_id = index.add(resume_doc, name, owner, signature=signature)
+        if not matches:
+            return doc_id, None, None
+        # Prefer the closest duplicate that was already analyzed for this job description
+        for match in matches:
+            previous_result = index.result(match[0], jd)
+            if previous_result is not None:
+                return doc_id, match, previous_result
+        return doc_id, matches[0], None
+    except Exception as e:
+        print(f"Error checking for near-duplicate resumes: {e}")
+        return None, None, None
+
+def show_near_duplicate(duplicate, resume_text, name, owner):
+    """Flag an earlier near-duplicate of the owner's and show what changed since"""
+    doc_id, previous_name, similarity = duplicate
+    st.info(f"♻️ This resume is a near-duplicate ({round(similarity * 100)}% similar) of **{previous_name}**, analyzed earlier.")
+    previous_text = near_duplicates.get_duplicate_index().text(doc_id, owner)
+    if previous_text is not None:
+        with st.expander("🔀 Changes since the earlier version", expanded=False):
+            diff = near_duplicates.text_diff(previous_text, resume_text, previous_name, name)
+            if diff:
+                st.code(diff, language="diff")
+            else:
+                st.write("No text changes.")
+
+def start_ai_analysis(jd, resume_text, mode, fan_out=False, structured=False):
+    """Start the model call(s) for an analysis in the background
+
+    Returns ([(section title or None, StreamedResponse)], prompt token report).
+    The mode picks the model, prompt token budget and deadline; a quick scan
+    is one short summary. A structured deep analysis is one request for a
+    JSON object. With fan_out, every section of a deep analysis is its own
+    concurrent request with its own cache entry; otherwise one request
+    writes all sections.
+    """
+    model = llm_backends.get_backend(mode.model_name)
+    prompt_jd, prompt_resume, prompt_tokens = jd, resume_text, None
+    if app_config.PROMPT_COMPACTION:
+        prompt_jd, prompt_resume, prompt_tokens = prompt_compaction.compact_inputs(
+            jd, resume_text, mode.token_budget
+        )
+        metrics.increment('prompt.tokens_saved', prompt_tokens['tokens_saved'])
+    
+    def start(prompt, prompt_version, stream=app_config.LLM_STREAMING, validate=None):
+        if app_config.PROMPT_COMPACTION:
+            prompt_version = prompt_compaction.versioned(prompt_version, mode.token_budget)
+        cache_key = response_cache.response_key(prompt_resume, prompt_jd, prompt_version, model.name)
+        return llm_client.StreamedResponse(model, prompt, cache_key, stream=stream,
+                                           timeout=mode.timeout, validate=validate).start()
+    
+    if mode.name == 'quick':
+        prompt = prompts.QUICK_PROMPT.format(jd=prompt_jd, extracted_text=prompt_resume)
+        return [("QUICK SUMMARY", start(prompt, prompts.QUICK_PROMPT_VERSION))], prompt_tokens
+    
+    if structured:
+        # Partial JSON is not worth showing, so there is nothing to stream
+        prompt = prompts.STRUCTURED_PROMPT.format(jd=prompt_jd, extracted_text=prompt_resume)
+        return [(None, start(prompt, prompts.STRUCTURED_PROMPT_VERSION, stream=False,
+                             validate=structured_analysis.is_valid))], prompt_tokens
+    
+    if not fan_out:
+        prompt = prompts.ANALYSIS_PROMPT.format(jd=prompt_jd, extracted_text=prompt_resume)
+        return [(None, start(prompt, prompts.ANALYSIS_PROMPT_VERSION))], prompt_tokens
+    
+    responses = []
+    for title, instruction, section_version in prompts.ANALYSIS_SECTIONS:
+        prompt = prompts.SECTION_PROMPT.format(jd=prompt_jd, extracted_text=prompt_resume,
+                                               title=title, instruction=instruction)
+        section_prompt_version = f"{prompts.SECTION_PROMPT_VERSION}/{title}@{section_version}"
+        responses.append((title, start(prompt, section_prompt_version)))
+    return responses, prompt_tokens
+
+def render_ai_analysis(responses, prompt_tokens):
+    """Render the analysis as it streams in; returns (full text, timings or None)"""
+    parts = []
+    for title, response in responses:
+        if title is None:
+            st.write_stream(response)
+            parts.append(response.text)
+        else:
+            # Sections were all requested at once, so later ones are usually ready by now
+            st.markdown(f"**{title}:**")
+            st.write_stream(response)
+            parts.append(f"**{title}:**\n{response.text.strip()}")
+    return '\n\n'.join(parts), show_ai_call_details(responses, prompt_tokens)
+
+def render_structured_analysis(analysis):
+    """Show the fields of a structured analysis"""
+    st.metric("🤖 AI Match Score", f"{analysis['match_percentage']}%")
+    for field, heading in structured_analysis.SECTIONS[1:]:
+        value = analysis[field]
+        st.markdown(f"**{heading}:**")
+        if isinstance(value, list):
+            st.markdown('\n'.join(f"- {item}" for item in value) or "_None_")
+        else:
+            st.markdown(value)
+
+def render_ai_structured(responses, prompt_tokens):
+    """Wait for a structured analysis and show it
+
+    Returns (analysis text, validated analysis or None, timings or None); a
+    response that cannot be parsed is shown as plain text instead.
+    """
+    _, response = responses[0]
+    with st.spinner("🤖 Waiting for the structured AI analysis..."):
+        text = ''.join(response)
+    analysis = structured_analysis.parse_analysis(text)
+    if analysis is None:
+        st.warning("The AI response did not match the expected format; showing it as text.")
+        st.markdown(text)
+    else:
+        render_structured_analysis(analysis)
+        text = structured_analysis.to_markdown(analysis)
+    return text, analysis, show_ai_call_details(responses, prompt_tokens)
+
+def show_ai_call_details(responses, prompt_tokens):
+    """Caption compaction, coalescing, cache use and timing; returns timings or None"""
+    if prompt_tokens is not None and prompt_tokens['tokens_saved'] > 0:
+        st.caption(f"✂️ Prompt compacted from ~{prompt_tokens['original_tokens']:,} to "
+                   f"~{prompt_tokens['tokens']:,} tokens ({prompt_tokens['tokens_saved']:,} saved)")
+    if any(response.coalesced for _, response in responses):
+        st.caption("🔗 Joined an identical analysis that was already in progress")
+    called = [response for _, response in responses if not response.cache_hit]
+    if not called:
+        st.caption("⚡ Served from the response cache")
+        return None
+    if len(called) < len(responses):
+        st.caption(f"⚡ {len(responses) - len(called)} of {len(responses)} sections served from the response cache")
+    first_tokens = [response.timer.ttft for response in called if response.timer.ttft is not None]
+    timings = {
+        'time_to_first_token_s': round(min(first_tokens), 3) if first_tokens else None,
+        'total_s': round(max(response.timer.total for response in called), 3),
+    }
+    st.caption(f"⏱️ First token after {timings['time_to_first_token_s']}s, complete after {timings['total_s']}s")
+    return timings
+
+def run_library_search(jd, top_k, semantic=False):
+    """Top-k search of the stored resume library for a job description"""
+    index = resume_index.get_resume_index()
+    if index is None:
+        st.info("📚 The resume library is disabled on this server.")
+        return
+    
+    if semantic:
+        matches = ann_index.search(jd, k=top_k)
+        if matches is None:
+            st.info("🧠 Semantic search needs a trained LSA model; showing keyword matches instead.")
+            semantic = False
+    if not semantic:
+        matches = index.search(jd, k=top_k)
+    
+    st.markdown("---")
+    st.markdown("## 🔎 Library Search Results")
+    st.metric("📚 Resumes in Library", len(index))
+    if not matches:
+        st.info("No stored resumes match this job description yet.")
+        return
+    
+    score_label = 'Semantic Score (%)' if semantic else 'Match Score (%)'
+    results = pd.DataFrame({
+        'Rank': range(1, len(matches) + 1),
+        'Resume': [name for _, name, _ in matches],
+        score_label: [round(max(score, 0.0) * 100, 2) for _, _, score in matches],
+    })
+    st.dataframe(results, use_container_width=True, hide_index=True)
+
+def save_analysis_history(user_email, jd, filename, match_percentage, missing_keywords, ai_structured=None):
+    """Save analysis to user history (if Firebase is available)
+
+    A structured AI analysis is stored with it as compact JSON, so history
+    views can show the AI's fields without calling the model again.
+    """
     try:
         if db:
             timestamp = int(time.time())
@@ -164,6 +425,9 @@ def save_analysis_history(user_email, jd, filename, match_percentage, missing_ke
                 'missing_keywords': missing_keywords[:5],  # Store top 5
                 'timestamp': timestamp
             }
+            if ai_structured is not None:
+                analysis_data['ai_match_percentage'] = ai_structured['match_percentage']
+                analysis_data['ai_analysis'] = structured_analysis.dumps(ai_structured)
             db.child("users").child(user_email.replace(".", "_")).child("history").push(analysis_data)
             return True
     except Exception as e:
@@ -300,21 +564,86 @@ def app():
                 placeholder="Copy and paste the job description from the company's website..."
             )
             
-            # File upload with enhanced styling
-            st.markdown("#### Resume Upload")
-            st.markdown('<div class="upload-container">', unsafe_allow_html=True)
-            uploaded_file = st.file_uploader(
-                "Choose your resume file",
-                type=["pdf", "docx", "png", "jpeg", "jpg"],
-                help="Supported formats: PDF, DOCX, PNG, JPEG"
+            modes = ["📄 Single Resume", "📚 Batch Ranking"]
+            if app_config.RESUME_INDEX_ENABLED:
+                # The library is shared by every user of this server
+                modes.append("🔎 Search Library")
+            analysis_mode = st.radio(
+                "Analysis mode",
+                modes,
+                horizontal=True,
+                help="Batch ranking scores many resumes against one job description; "
+                     "library search (when enabled on this server) finds the best matches among every resume "
+                     "uploaded to it"
             )
-            st.markdown('</div>', unsafe_allow_html=True)
+            batch_mode = analysis_mode == "📚 Batch Ranking"
+            search_mode = analysis_mode == "🔎 Search Library"
+            
+            # File upload with enhanced styling
+            uploaded_file = None
+            batch_files = []
+            if search_mode:
+                top_k = st.slider("Number of matches to return", min_value=5, max_value=100, value=20, step=5)
+                semantic_search = st.toggle(
+                    "🧠 Semantic search",
+                    help="Find resumes with related wording using the approximate nearest-neighbour index"
+                )
+            else:
+                st.markdown("#### Resume Upload")
+                st.markdown('<div class="upload-container">', unsafe_allow_html=True)
+                if batch_mode:
+                    batch_files = st.file_uploader(
+                        "Choose resume files or a zip archive",
+                        type=["pdf", "docx", "png", "jpeg", "jpg", "zip"],
+                        accept_multiple_files=True,
+                        help="Supported formats: PDF, DOCX, PNG, JPEG, or a ZIP containing them"
+                    )
+                else:
+                    uploaded_file = st.file_uploader(
+                        "Choose your resume file",
+                        type=["pdf", "docx", "png", "jpeg", "jpg"],
+                        help="Supported formats: PDF, DOCX, PNG, JPEG"
+                    )
+                    depth = st.radio(
+                        "Analysis depth",
+                        list(analysis_modes.MODES),
+                        index=1,
+                        format_func=lambda name: analysis_modes.MODES[name].label,
+                        horizontal=True,
+                        help="A quick scan returns a short AI verdict from a faster model within a few seconds; "
+                             "a deep analysis writes the full report"
+                    )
+                    fan_out_sections = st.checkbox(
+                        "⚡ Parallel section analysis",
+                        value=app_config.LLM_SECTION_FANOUT,
+                        help="Request each section of the AI analysis separately and concurrently; "
+                             "sections are cached on their own"
+                    )
+                    structured_output = st.checkbox(
+                        "🧾 Structured AI output",
+                        value=app_config.STRUCTURED_OUTPUT,
+                        help="Ask for the deep analysis as validated JSON fields (AI score, strengths, keywords, "
+                             "recommendations, skill gaps) that are stored with the history and report"
+                    )
+                    reuse_duplicates = st.checkbox(
+                        "♻️ Reuse the AI analysis of a near-duplicate resume",
+                        value=False,
+                        help="Skip the AI call when you already analyzed an almost identical resume for this "
+                             "job description; small edits will not be reflected in the AI analysis"
+                    )
+                st.markdown('</div>', unsafe_allow_html=True)
             
             # Analysis controls
             col_submit, col_clear = st.columns([1, 1])
             
             with col_submit:
-                analyze_btn = st.button("🔍 Analyze Resume", type="primary", use_container_width=True)
+                analyze_btn = rank_btn = search_btn = False
+                if search_mode:
+                    search_btn = st.button("🔎 Search Library", type="primary", use_container_width=True)
+                elif batch_mode:
+                    rank_btn = st.button("🏆 Rank Resumes", type="primary", use_container_width=True)
+                else:
+                    analyze_btn = st.button("🔍 Analyze Resume", type="primary", use_container_width=True)
             
             with col_clear:
                 if st.button("🗑️ Clear All", use_container_width=True):
@@ -328,6 +657,25 @@ def app():
                 st.session_state.analysis_count = 0
             
             st.metric("📊 Analyses Today", st.session_state.analysis_count)
+            ttft = metrics.summary('llm.ttft')
+            if ttft is not None:
+                st.metric("⏱️ AI First Token (p50)", f"{ttft['p50']:.2f}s",
+                          help=f"p95 {ttft['p95']:.2f}s over the last {ttft['count']} AI calls on this server")
+            coalesced = metrics.count('llm.coalesced')
+            if coalesced:
+                st.metric("🔗 AI Calls Coalesced", coalesced,
+                          help="Requests that joined an identical analysis already in progress instead of calling the AI again")
+            tokens_saved = metrics.count('prompt.tokens_saved')
+            if tokens_saved:
+                st.metric("✂️ Prompt Tokens Saved", f"{tokens_saved:,}",
+                          help="Estimated input tokens removed by prompt compaction on this server")
+            for mode in analysis_modes.MODES.values():
+                slo = analysis_modes.slo_report(mode)
+                if slo is not None:
+                    st.metric(f"{mode.label} (p95)", f"{slo['p95']:.1f}s",
+                              delta=f"{slo['within_slo']:.0%} within {slo['slo_seconds']:g}s SLO",
+                              delta_color="off",
+                              help=f"End-to-end latency over the last {slo['count']} analyses in this mode on this server")
             
             # Tips section
             with st.expander("💡 Pro Tips", expanded=False):
@@ -341,7 +689,11 @@ def app():
                 """)
         
         # Analysis processing
-        if analyze_btn:
+        # A quick scan can be escalated to a deep analysis of the same inputs
+        escalated = st.session_state.pop('escalate_to_deep', False) and not (batch_mode or search_mode)
+        if analyze_btn or escalated:
+            mode = analysis_modes.MODES['deep' if escalated else depth]
+            analysis_started = time.perf_counter()
             if uploaded_file is not None and jd.strip():
                 with st.spinner('🔄 Analyzing your resume... This may take a moment.'):
                     # Extract text based on file type
@@ -356,55 +708,35 @@ def app():
                         extracted_text = extract_text_from_image(uploaded_file)
                     
                     if extracted_text.strip():
+                        # Analyze each document once; scoring, keywords and charts share it
+                        jd_doc = analyze_text(jd)
+                        resume_doc = analyze_text(extracted_text)
+                        resume_index.index_resume(resume_doc, uploaded_file.name)
+                        owner = current_owner()
+                        doc_id, duplicate, previous_result = find_near_duplicate(resume_doc, uploaded_file.name, jd, owner)
+                        ai_finished = None
                         try:
-                            # Enhanced prompt for better analysis
-                            enhanced_prompt = f"""
-                            You are an expert ATS (Application Tracking System) analyzer and career counselor. 
-                            Analyze the following resume against the job description with high precision.
-                            
-                            Job Description:
-                            {jd}
-                            
-                            Resume Content:
-                            {extracted_text}
-                            
-                            Please provide a detailed analysis in the following format:
-                            
-                            **MATCH PERCENTAGE:** [Provide exact percentage 0-100]
-                            
-                            **KEY STRENGTHS:**
-                            • [List 3-5 key matching strengths]
-                            
-                            **MISSING KEYWORDS:**
-                            • [List 5-10 important missing keywords from job description]
-                            
-                            **IMPROVEMENT RECOMMENDATIONS:**
-                            • [Provide 3-5 specific actionable recommendations]
-                            
-                            **SKILLS GAP ANALYSIS:**
-                            • [Identify skill gaps and suggest improvements]
-                            
-                            **OVERALL ASSESSMENT:**
-                            [Provide comprehensive feedback and next steps]
-                            """
-                            
-                            # Generate AI analysis
-                            response = model.generate_content(enhanced_prompt)
+                            # The model call starts first and runs in the background while the
+                            # local scores are computed and rendered; the two branches join below
+                            # Stored near-duplicate results are full analyses, so only deep mode reuses them
+                            reused = mode.name == 'deep' and reuse_duplicates and previous_result is not None
+                            structured = mode.name == 'deep' and structured_output
+                            responses, prompt_tokens = [], None
+                            if not reused:
+                                responses, prompt_tokens = start_ai_analysis(jd, extracted_text, mode,
+                                                                             fan_out=fan_out_sections,
+                                                                             structured=structured)
                             
-                            # Calculate technical metrics
-                            match_percentage = calculate_match_percentage(jd, extracted_text)
-                            missing_keywords = find_missing_keywords(jd, extracted_text)
-                            
-                            # Save to history
-                            user_email = st.session_state.get('user_email', 'anonymous')
-                            save_analysis_history(user_email, jd, uploaded_file.name, match_percentage, missing_keywords)
-                            
-                            # Update session stats
-                            st.session_state.analysis_count += 1
+                            match_percentage = calculate_match_percentage(jd_doc, resume_doc)
+                            semantic_score = semantic_model.semantic_similarity(jd_doc, resume_doc)
+                            keyword_weights = dict(keyword_ranking.rank_missing_keywords(jd_doc, resume_doc, k=10))
+                            missing_keywords = list(keyword_weights)
                             
                             # Display results
                             st.markdown("---")
                             st.markdown("## 📊 Analysis Results")
+                            if duplicate is not None:
+                                show_near_duplicate(duplicate, extracted_text, uploaded_file.name, owner)
                             
                             # Results in columns
                             result_col1, result_col2 = st.columns([1, 1])
@@ -419,6 +751,12 @@ def app():
                                 st.metric("📈 Match Score", f"{match_percentage}%")
                                 st.markdown('</div>', unsafe_allow_html=True)
                                 
+                                if semantic_score is not None:
+                                    st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+                                    st.metric("🧠 Semantic Match", f"{round(semantic_score * 100, 2)}%",
+                                              help="Similarity in a latent semantic space, so related wording counts")
+                                    st.markdown('</div>', unsafe_allow_html=True)
+                                
                                 st.markdown('<div class="metric-container">', unsafe_allow_html=True)
                                 st.metric("🔍 Keywords Missing", len(missing_keywords))
                                 st.markdown('</div>', unsafe_allow_html=True)
@@ -426,13 +764,44 @@ def app():
                             with result_col2:
                                 # Missing keywords chart
                                 if missing_keywords:
-                                    keyword_fig = create_keyword_chart(missing_keywords)
+                                    keyword_fig = create_keyword_chart(missing_keywords, keyword_weights)
                                     if keyword_fig:
                                         st.plotly_chart(keyword_fig, use_container_width=True)
                             
-                            # AI Analysis Results
+                            # AI Analysis Results, rendered as the model writes them,
+                            # unless a near-duplicate was already analyzed
                             st.markdown("### 🤖 AI-Powered Analysis")
-                            st.markdown(response.text)
+                            timings = ai_structured = None
+                            if reused:
+                                ai_analysis = previous_result['ai_analysis']
+                                ai_structured = previous_result.get('structured')
+                                st.caption(f"♻️ Reused from the earlier analysis of {duplicate[1]}")
+                                if ai_structured is not None:
+                                    render_structured_analysis(ai_structured)
+                                else:
+                                    st.markdown(ai_analysis)
+                            else:
+                                if structured:
+                                    ai_analysis, ai_structured, timings = render_ai_structured(responses, prompt_tokens)
+                                else:
+                                    ai_analysis, timings = render_ai_analysis(responses, prompt_tokens)
+                                if doc_id is not None and mode.name == 'deep':
+                                    near_duplicates.get_duplicate_index().save_result(
+                                        doc_id, jd, {'ai_analysis': ai_analysis, 'structured': ai_structured}
+                                    )
+                            ai_finished = time.perf_counter()
+                            if mode.name == 'quick':
+                                st.button("🔬 Escalate to deep analysis",
+                                          on_click=lambda: st.session_state.update(escalate_to_deep=True),
+                                          help="Run the full AI analysis of this resume and job description")
+                            
+                            # Save to history
+                            user_email = st.session_state.get('user_email', 'anonymous')
+                            save_analysis_history(user_email, jd, uploaded_file.name, match_percentage, missing_keywords,
+                                                  ai_structured)
+                            
+                            # Update session stats
+                            st.session_state.analysis_count += 1
                             
                             # Action items
                             st.markdown("### ✅ Next Steps")
@@ -448,8 +817,13 @@ def app():
                                 'job_description': jd,
                                 'filename': uploaded_file.name,
                                 'match_percentage': match_percentage,
+                                'semantic_match_percentage': None if semantic_score is None else round(semantic_score * 100, 2),
                                 'missing_keywords': missing_keywords,
-                                'ai_analysis': response.text,
+                                'ai_analysis': ai_analysis,
+                                'ai_structured': ai_structured,
+                                'analysis_mode': mode.name,
+                                'timings': timings,
+                                'prompt_tokens': prompt_tokens,
                                 'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
                             }
                             
@@ -463,10 +837,26 @@ def app():
                             
                         except Exception as e:
                             st.error(f"❌ Analysis failed: {str(e)}")
+                        finally:
+                            # Failed analyses (deadline overruns included) count against the SLO too
+                            analysis_modes.record_latency(mode, (ai_finished or time.perf_counter()) - analysis_started,
+                                                          failed=ai_finished is None)
                     else:
                         st.error("❌ Could not extract text from the uploaded file. Please try a different file.")
             else:
                 st.warning("⚠️ Please provide both a job description and upload your resume.")
+        
+        if rank_btn:
+            if batch_files and jd.strip():
+                run_batch_ranking(jd, batch_files)
+            else:
+                st.warning("⚠️ Please provide a job description and upload at least one resume.")
+        
+        if search_btn:
+            if jd.strip():
+                run_library_search(jd, top_k, semantic=semantic_search)
+            else:
+                st.warning("⚠️ Please provide a job description to search with.")
     
     with tab2:
         st.markdown("### 📊 Analytics Dashboard")
@@ -538,7 +928,14 @@ def app():
              "Yes! The system saves your analysis history (when logged in) so you can track improvements in your match scores over time."),
             
             ("Is my data secure?", 
-             "Absolutely. We use secure Firebase authentication and don't store your actual resume content permanently. Analysis data is encrypted and protected.")
+             "Sign-in uses Firebase authentication, and your history in Firebase keeps only scores, the top missing keywords "
+             "and, for structured analyses, the AI's fields. To make repeat analyses fast, this server also keeps the "
+             "extracted text of uploaded resumes on its own disk: in the extraction cache (size-limited, oldest entries "
+             "removed first) and in the near-duplicate store, which only you can see. Servers run by recruiters can "
+             "also enable a shared resume library, in which case every uploaded resume can be found by anyone using "
+             "that server's library search. AI responses are cached for a limited time. The server "
+             "operator can turn these stores off (`RESUME_INDEX_ENABLED`, `NEAR_DUPLICATE_DETECTION`, "
+             "`RESPONSE_CACHE_ENABLED`) or delete them by clearing the cache directory (`ATS_CACHE_DIR`).")
         ]
         
         for question, answer in faqs:
@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+
+import app_config
+
+# Bump the version of an extractor whenever its output changes so that
+# stale cache entries are never served for the new implementation.
+EXTRACTOR_VERSIONS = {
+    'pdf': '3',
+    'docx': '2',
+    'image': '2',
+}
+
+# Settings an extractor's output depends on; they are part of the cache key so that
+# changing one (another OCR language, preprocessing, PDF OCR fallback) re-extracts
+OCR_SETTINGS = ['OCR_LANG', 'OCR_TARGET_DPI', 'OCR_GRAYSCALE', 'OCR_BINARIZE', 'OCR_DESKEW']
+EXTRACTOR_SETTINGS = {
+    'pdf': ['PDF_OCR_FALLBACK', 'PDF_MIN_TEXT_CHARS'] + OCR_SETTINGS,
+    'docx': [],
+    'image': OCR_SETTINGS,
+}
+
+
+class IncompleteText(str):
+    """Extracted text missing some content because part of the extraction failed
+
+    Returned as is to the caller, but never cached, so the next upload retries.
+    """
+
+
+def read_upload_bytes(file):
+    """Return the raw bytes of an uploaded file without consuming it"""
+    if hasattr(file, 'getvalue'):
+        data = file.getvalue()
+    else:
+        position = file.tell() if hasattr(file, 'tell') else None
+        if position is not None:
+            file.seek(0)
+        data = file.read()
+        if position is not None:
+            file.seek(position)
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    return data
+
+
+def content_key(data, kind):
+    """SHA-256 of the file bytes combined with the extractor kind, version and settings"""
+    settings = json.dumps([getattr(app_config, name) for name in EXTRACTOR_SETTINGS[kind]])
+    digest = hashlib.sha256()
+    digest.update(f"{kind}:{EXTRACTOR_VERSIONS[kind]}:{settings}:".encode('utf-8'))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Two-tier (memory LRU + disk) cache of extracted resume text"""
+
+    def __init__(self, directory, memory_items=128, disk_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_usage = None
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.txt')
+
+    def _remember(self, key, text):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            os.utime(path)  # keep recently used entries at the back of the eviction queue
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._remember(key, text)
+            self.hits += 1
+        return text
+
+    def set(self, key, text):
+        with self._lock:
+            self._remember(key, text)
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+            self._account(os.path.getsize(path))
+        except OSError as e:
+            print(f"Error writing extraction cache: {e}")
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.txt'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _account(self, added_bytes):
+        with self._lock:
+            if self._disk_usage is None:
+                self._disk_usage = sum(size for _, size, _ in self._scan())
+            else:
+                self._disk_usage += added_bytes
+            if self._disk_usage <= self.disk_bytes:
+                return
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until usage drops below 90% of the limit"""
+        entries = sorted(self._scan())
+        usage = sum(size for _, size, _ in entries)
+        target = int(self.disk_bytes * 0.9)
+        for _, size, path in entries:
+            if usage <= target:
+                break
+            try:
+                os.remove(path)
+                usage -= size
+            except OSError:
+                pass
+        self._disk_usage = usage
+
+
+extraction_cache = ExtractionCache(
+    os.path.join(app_config.CACHE_DIR, 'extraction'),
+    memory_items=app_config.EXTRACTION_CACHE_MEMORY_ITEMS,
+    disk_bytes=app_config.EXTRACTION_CACHE_DISK_BYTES,
+)
+
+
+def cached_extraction(kind):
+    """Decorator placing the extraction cache in front of a file extractor"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(file):
+            try:
+                data = read_upload_bytes(file)
+            except Exception as e:
+                print(f"Error reading upload for cache: {e}")
+                return func(file)
+
+            key = content_key(data, kind)
+            text = extraction_cache.get(key)
+            if text is not None:
+                return text
+
+            text = func(file)
+            # Failed, partial or empty extractions are not cached so they can be retried
+            if text and text.strip() and not isinstance(text, IncompleteText):
+                extraction_cache.set(key, text)
+            return text
+        return wrapper
+    return decorator
@@ -0,0 +1,112 @@
+from PIL import Image, ImageOps
+
+import app_config
+
+# Long edge of a US Letter / A4 page in inches, used when the image carries no DPI
+PAGE_LONG_EDGE_INCHES = 11.7
+
+
+def _target_size(image, target_dpi):
+    width, height = image.size
+    dpi = image.info.get('dpi')
+    scale = 1.0
+    if dpi and dpi[0] and dpi[0] > target_dpi:
+        scale = target_dpi / float(dpi[0])
+    max_edge = int(PAGE_LONG_EDGE_INCHES * target_dpi)
+    if max(width, height) * scale > max_edge:
+        scale = max_edge / float(max(width, height))
+    if scale >= 1.0:
+        return None
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def otsu_threshold(image):
+    """Compute Otsu's global threshold from the histogram of a grayscale image"""
+    histogram = image.histogram()[:256]
+    total = sum(histogram)
+    sum_all = sum(i * count for i, count in enumerate(histogram))
+    sum_background = 0.0
+    weight_background = 0
+    best_threshold, best_variance = 127, -1.0
+    for level in range(256):
+        weight_background += histogram[level]
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+        sum_background += level * histogram[level]
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = level, variance
+    return best_threshold
+
+
+def _profile_score(image, angle):
+    rotated = image.rotate(angle, resample=Image.NEAREST, fillcolor=255)
+    # Shrinking to one pixel wide averages every row: a horizontal projection profile
+    rows = list(rotated.resize((1, rotated.height), Image.BOX).getdata())
+    mean = sum(rows) / len(rows)
+    return sum((value - mean) ** 2 for value in rows)
+
+
+def estimate_skew(image, max_angle=5.0):
+    """Estimate the skew angle in degrees by maximising projection-profile variance"""
+    sample = image.convert('L')
+    sample.thumbnail((800, 800))
+    best_angle = 0.0
+    best_score = _profile_score(sample, 0.0)
+    for step, span in ((0.5, max_angle), (0.1, 0.5)):
+        center = best_angle
+        count = int(round(span / step))
+        for i in range(-count, count + 1):
+            angle = center + i * step
+            if angle == best_angle:
+                continue
+            score = _profile_score(sample, angle)
+            if score > best_score:
+                best_angle, best_score = angle, score
+    return best_angle
+
+
+def preprocess_image(image, target_dpi=None, grayscale=None, binarize=None, deskew=None):
+    """Prepare an uploaded image for OCR: orient, downscale, grayscale, binarize, deskew"""
+    target_dpi = app_config.OCR_TARGET_DPI if target_dpi is None else target_dpi
+    grayscale = app_config.OCR_GRAYSCALE if grayscale is None else grayscale
+    binarize = app_config.OCR_BINARIZE if binarize is None else binarize
+    deskew = app_config.OCR_DESKEW if deskew is None else deskew
+
+    # The target size comes from the original image only: draft() shrinks the pixels but
+    # keeps info['dpi'], so recomputing it afterwards would scale down a second time
+    size = _target_size(image, target_dpi) if target_dpi else None
+    if size and image.format == 'JPEG':
+        # Let the JPEG decoder downscale by a power of two before full decode
+        image.draft('L' if grayscale else 'RGB', size)
+
+    image = ImageOps.exif_transpose(image)
+
+    if size:
+        if (image.width > image.height) != (size[0] > size[1]):
+            # EXIF orientation turned the page by 90 degrees
+            size = size[::-1]
+        if image.size != size:
+            image = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+    if grayscale or binarize:
+        image = image.convert('L')
+    elif image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    if binarize:
+        threshold = otsu_threshold(image)
+        image = image.point([0 if level <= threshold else 255 for level in range(256)])
+
+    if deskew:
+        angle = estimate_skew(image)
+        if angle:
+            fill = 255 if image.mode == 'L' else (255, 255, 255)
+            image = image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=fill)
+
+    return image
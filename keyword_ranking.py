@@ -0,0 +1,60 @@
+import heapq
+
+import scoring_model
+import skill_matcher
+from text_processing import as_analyzed, tokenize
+
+
+def _idf(model, term):
+    # Terms outside the corpus vocabulary are rarer than anything in it
+    return model.term_weight(term) or model.max_idf
+
+
+def weight_label():
+    """What rank_missing_keywords weights measure, or None when they do not follow the ranking
+
+    Without an IDF model weights are JD mention counts, and a skill mentioned
+    once still ranks ahead of a term mentioned twice.
+    """
+    if scoring_model.get_scoring_model().kind == 'hashing':
+        return None
+    return 'Importance (IDF × JD frequency)'
+
+
+def rank_missing_keywords(jd, resume, k=10):
+    """Top-k missing job description keywords as (keyword, weight) pairs
+
+    Every dictionary skill and every other JD term absent from the resume is
+    weighted by corpus IDF x frequency in the JD; skills use the highest IDF
+    among their canonical name's in-vocabulary tokens. Only the k best are kept (heap
+    selection), with ties broken by first appearance in the JD so the result
+    is reproducible. Without an IDF model every term weighs the same, so
+    missing skills rank ahead of other terms.
+    """
+    model = scoring_model.get_scoring_model()
+    jd_doc = as_analyzed(jd)
+    resume_doc = as_analyzed(resume)
+    best = heapq.nlargest(k, _candidates(model, jd_doc, resume_doc), key=lambda candidate: candidate[:3])
+    return [(keyword, round(weight, 3)) for _, weight, _, keyword in best]
+
+
+def _candidates(model, jd_doc, resume_doc):
+    """Yield (tier, weight, -first_position, keyword) for every missing keyword"""
+    # Uniform hashing weights cannot tell skills from filler words: put skills in a higher tier
+    skill_tier = 1 if model.kind == 'hashing' else 0
+    jd_skills = skill_matcher.match_skills(jd_doc)
+    resume_skills = skill_matcher.match_skills(resume_doc).counts
+    for name, count in jd_skills.counts.items():
+        if name not in resume_skills:
+            idf = max((model.term_weight(token) for token in tokenize(name)), default=0) or model.max_idf
+            yield skill_tier, count * idf, -jd_skills.first_position[name], name
+
+    first_position = {}
+    for position, token in enumerate(jd_doc.tokens):
+        first_position.setdefault(token, position)
+
+    # Words belonging to a recognised skill are already represented by the skill
+    covered_tokens = jd_skills.covered_tokens
+    for term, count in jd_doc.counts.items():
+        if term not in resume_doc.counts and term not in covered_tokens:
+            yield 0, count * _idf(model, term), -first_position[term], term
@@ -0,0 +1,195 @@
+"""Language model backends behind one small interface.
+
+A backend has a ``name`` (part of the response cache key) and a
+``generate_content(prompt, stream=False, request_options=None)`` method
+returning an object with ``.text``, or an iterable of such chunks when
+streaming, the same shape as ``google.generativeai.GenerativeModel``.
+
+``LLM_BACKEND=gemini`` (default) calls Google Gemini. ``LLM_BACKEND=stub``
+answers offline with canned analyses after a configurable latency, error
+rate and chunking, for load tests and benchmarks that must not spend quota
+or need network access.
+"""
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+
+import app_config
+
+
+class TransientLLMError(ConnectionError):
+    """A failure worth retrying (injected by the stub backend)"""
+
+
+class GeminiBackend:
+    """Google Gemini, configured on first use rather than at import"""
+
+    _configure_lock = threading.Lock()
+    _configured = False
+
+    def __init__(self, model_name):
+        self.name = model_name
+        self._model = None
+
+    def _get_model(self):
+        if self._model is None:
+            import google.generativeai as genai
+            with GeminiBackend._configure_lock:
+                if not GeminiBackend._configured:
+                    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+                    GeminiBackend._configured = True
+            self._model = genai.GenerativeModel(self.name)
+        return self._model
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        kwargs = {} if request_options is None else {'request_options': request_options}
+        return self._get_model().generate_content(prompt, stream=stream, **kwargs)
+
+
+class StubText:
+    """Response or chunk object with a ``text`` attribute"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+STUB_STRENGTHS = [
+    "Hands-on experience with the core technologies named in the job description",
+    "Clear record of delivering projects end to end",
+    "Relevant domain experience in similar roles",
+    "Evidence of collaboration with cross-functional teams",
+    "Quantified achievements that show impact",
+]
+STUB_RECOMMENDATIONS = [
+    "Mirror the exact skill names used in the job description",
+    "Quantify results for each recent role",
+    "Move the most relevant experience to the top of the resume",
+    "Add a short skills summary aligned with the posting",
+    "Remove outdated or unrelated technologies",
+]
+
+
+class StubBackend:
+    """Offline backend returning canned analyses with injected latency and errors
+
+    Latency before the first chunk is lognormal with the given median and
+    sigma; each further chunk adds ``chunk_delay`` seconds. ``error_rate``
+    of calls fail with TransientLLMError before producing anything.
+    Answers are deterministic for a given prompt.
+    """
+
+    def __init__(self, model_name='stub', latency_median=1.5, latency_sigma=0.5, chunk_delay=0.05,
+                 chunk_words=12, error_rate=0.0, seed=None):
+        self.name = f"stub:{model_name}"
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.chunk_delay = chunk_delay
+        self.chunk_words = chunk_words
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def _draw(self):
+        with self._random_lock:
+            failed = self._random.random() < self.error_rate
+            latency = self.latency_median * self._random.lognormvariate(0, self.latency_sigma) if self.latency_median else 0.0
+        return failed, latency
+
+    def analysis(self, prompt):
+        """Canned analysis in the section layout the analysis prompt asks for
+
+        A prompt asking for a single section gets only that section's body,
+        and one asking for JSON gets the analysis as a JSON object.
+        """
+        rng = random.Random(hashlib.sha256(prompt.encode('utf-8')).digest())
+        words = sorted({word for word in re.findall(r"[A-Za-z][A-Za-z+#.]{2,}", prompt) if word[0].isupper()})
+        keywords = rng.sample(words, min(6, len(words))) if words else ['Communication']
+        fields = {
+            'match_percentage': rng.randint(35, 95),
+            'strengths': rng.sample(STUB_STRENGTHS, 3),
+            'missing_keywords': keywords,
+            'recommendations': rng.sample(STUB_RECOMMENDATIONS, 3),
+            'skills_gaps': [f"Build working experience with {keyword}" for keyword in keywords[:3]],
+            'overall_assessment': "This is a canned analysis from the offline stub backend.",
+        }
+        if "Respond with only a JSON object" in prompt:
+            return json.dumps(fields, indent=2)
+        sections = [
+            f"**MATCH PERCENTAGE:** {fields['match_percentage']}%",
+            "**KEY STRENGTHS:**\n" + '\n'.join(f"• {item}" for item in fields['strengths']),
+            "**MISSING KEYWORDS:**\n" + '\n'.join(f"• {keyword}" for keyword in fields['missing_keywords']),
+            "**IMPROVEMENT RECOMMENDATIONS:**\n" + '\n'.join(f"• {item}" for item in fields['recommendations']),
+            "**SKILLS GAP ANALYSIS:**\n" + '\n'.join(f"• {item}" for item in fields['skills_gaps']),
+            "**OVERALL ASSESSMENT:**\n" + fields['overall_assessment'],
+        ]
+        section = re.search(r"^Write only the (.+?) section", prompt, re.MULTILINE)
+        if section:
+            heading = f"**{section.group(1)}:**"
+            for text in sections:
+                if text.startswith(heading):
+                    return text[len(heading):].strip()
+            return f"Canned {section.group(1).lower()} from the offline stub backend: a {rng.choice(['strong', 'partial', 'weak'])} match."
+        return '\n\n'.join(sections)
+
+    def _chunks(self, text):
+        words = text.split(' ')
+        for start in range(0, len(words), self.chunk_words):
+            piece = ' '.join(words[start:start + self.chunk_words])
+            yield piece if start + self.chunk_words >= len(words) else piece + ' '
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        failed, latency = self._draw()
+        timeout = (request_options or {}).get('timeout')
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("stub backend latency exceeded the request timeout")
+        time.sleep(latency)
+        if failed:
+            raise TransientLLMError("stub backend injected failure")
+        text = self.analysis(prompt)
+        if not stream:
+            time.sleep(self.chunk_delay * max(0, len(list(self._chunks(text))) - 1))
+            return StubText(text)
+        return self._stream(text)
+
+    def _stream(self, text):
+        for i, piece in enumerate(self._chunks(text)):
+            if i:
+                time.sleep(self.chunk_delay)
+            yield StubText(piece)
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def create_backend(kind, model_name):
+    """Backend of the given kind ('gemini' or 'stub') for a model name"""
+    if kind == 'gemini':
+        return GeminiBackend(model_name)
+    if kind == 'stub':
+        return StubBackend(
+            model_name,
+            latency_median=app_config.LLM_STUB_LATENCY_SECONDS,
+            latency_sigma=app_config.LLM_STUB_LATENCY_SIGMA,
+            chunk_delay=app_config.LLM_STUB_CHUNK_DELAY_SECONDS,
+            chunk_words=app_config.LLM_STUB_CHUNK_WORDS,
+            error_rate=app_config.LLM_STUB_ERROR_RATE,
+        )
+    raise ValueError(f"Unknown LLM backend: {kind}")
+
+
+def get_backend(model_name=None):
+    """Process-wide backend selected by LLM_BACKEND, one per model name"""
+    model_name = model_name or app_config.GEMINI_MODEL
+    backend = _backends.get(model_name)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(model_name)
+            if backend is None:
+                backend = _backends[model_name] = create_backend(app_config.LLM_BACKEND, model_name)
+    return backend
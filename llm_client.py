@@ -0,0 +1,384 @@
+"""Calls to the language model: rate limiting, retries, streaming, caching and timing.
+
+All model calls in the process go through one asyncio client running on a
+background event-loop thread, so every Streamlit session shares the same
+token-bucket rate limits (requests and tokens per minute) and concurrency
+cap. Retryable errors are retried with jittered exponential backoff, and a
+deadline set by the caller bounds the whole call: waiting for the limiter,
+waiting for a slot, the request itself and every backoff sleep.
+"""
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from google.api_core import exceptions as google_exceptions
+
+import app_config
+import response_cache
+from metrics import metrics, GenerationTimer
+from prompt_compaction import count_tokens
+from llm_backends import TransientLLMError
+
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+    TransientLLMError,
+    ConnectionError,
+)
+
+class DeadlineExceededError(TimeoutError):
+    """The model call could not finish before the caller's deadline"""
+
+
+def _remaining(deadline):
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class TokenBucket:
+    """Asyncio token bucket: `capacity` tokens refilled at `rate` tokens per second
+
+    Only used from the client's event loop, so it needs no locking.
+    """
+
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1, deadline=None):
+        # A request larger than the whole bucket waits for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            wait = (amount - self.tokens) / self.rate
+            remaining = _remaining(deadline)
+            if remaining is not None and wait > remaining:
+                raise DeadlineExceededError("rate limit wait would exceed the deadline")
+            await asyncio.sleep(wait)
+
+
+class AsyncLLMClient:
+    """Process-wide model client on its own event loop thread"""
+
+    def __init__(self, requests_per_minute=60, tokens_per_minute=1000000, max_concurrency=4,
+                 max_retries=4, base_delay=1.0, max_delay=30.0, output_tokens=1024):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.output_tokens = output_tokens
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='llm')
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = None
+        self._thread = threading.Thread(target=self._run_loop, name='llm-event-loop', daemon=True)
+        self._thread.start()
+        self._semaphore = asyncio.run_coroutine_threadsafe(self._make_semaphore(max_concurrency), self._loop).result()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _make_semaphore(self, max_concurrency):
+        return asyncio.Semaphore(max_concurrency)
+
+    def submit(self, model, prompt, deadline=None, stream=False, on_chunk=None):
+        """Schedule a call from any thread; returns a concurrent.futures.Future of the full text"""
+        return asyncio.run_coroutine_threadsafe(self.generate(model, prompt, deadline, stream, on_chunk), self._loop)
+
+    async def _acquire_slot(self, deadline):
+        """Wait for a concurrency slot, no longer than the deadline allows"""
+        remaining = _remaining(deadline)
+        if remaining is None:
+            await self._semaphore.acquire()
+            return
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0.0, remaining))
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("no model call slot freed up before the deadline") from None
+
+    async def generate(self, model, prompt, deadline=None, stream=False, on_chunk=None):
+        """Full response text, calling on_chunk(text) for every streamed chunk"""
+        tokens = count_tokens(prompt) + self.output_tokens
+        attempt = 0
+        while True:
+            emitted = []
+            # Every attempt is a request the provider counts, retries included
+            await self._requests.acquire(1, deadline)
+            await self._tokens.acquire(tokens, deadline)
+            await self._acquire_slot(deadline)
+            try:
+                return await self._call(model, prompt, deadline, stream, on_chunk, emitted)
+            except RETRYABLE_ERRORS as e:
+                # Chunks already shown cannot be taken back, so a broken stream is not retried
+                if emitted or attempt >= self.max_retries:
+                    raise
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                remaining = _remaining(deadline)
+                if remaining is not None and delay >= remaining:
+                    raise DeadlineExceededError(f"no time left to retry after: {e}") from e
+                metrics.increment('llm.retries')
+                print(f"Retrying model call in {delay:.1f}s after: {e}")
+                attempt += 1
+            finally:
+                self._semaphore.release()
+            await asyncio.sleep(delay)
+
+    async def _call(self, model, prompt, deadline, stream, on_chunk, emitted):
+        remaining = _remaining(deadline)
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError("deadline passed before the model call started")
+        options = {} if remaining is None else {'request_options': {'timeout': remaining}}
+
+        def blocking_call():
+            if not stream:
+                return model.generate_content(prompt, **options).text
+            parts = []
+            for chunk in model.generate_content(prompt, stream=True, **options):
+                text = chunk.text
+                if text:
+                    parts.append(text)
+                    emitted.append(True)
+                    if on_chunk is not None:
+                        on_chunk(text)
+            return ''.join(parts)
+
+        call = self._loop.run_in_executor(self._executor, blocking_call)
+        try:
+            return await asyncio.wait_for(call, timeout=remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("model call did not finish before the deadline") from None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide client sharing rate limits and concurrency across sessions"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AsyncLLMClient(
+                    requests_per_minute=app_config.LLM_REQUESTS_PER_MINUTE,
+                    tokens_per_minute=app_config.LLM_TOKENS_PER_MINUTE,
+                    max_concurrency=app_config.LLM_MAX_CONCURRENCY,
+                    max_retries=app_config.LLM_MAX_RETRIES,
+                    output_tokens=app_config.LLM_OUTPUT_TOKENS,
+                )
+    return _client
+
+
+def _deadline(timeout):
+    timeout = app_config.LLM_TIMEOUT_SECONDS if timeout is None else timeout
+    return time.monotonic() + timeout if timeout else None
+
+
+def cached_generate(model, prompt, key, timeout=None):
+    """Blocking response text for a prompt, served from the cache or a call already in flight
+
+    Returns (text, hit), hit being True when the response cache answered.
+    """
+    response = StreamedResponse(model, prompt, key, stream=False, timeout=timeout)
+    text = ''.join(response)
+    return text, response.cache_hit
+
+
+class _Flight:
+    """One model call in progress whose chunks any number of readers can follow"""
+
+    def __init__(self):
+        self.chunks = []
+        self.first_chunk_at = None
+        self.error = None
+        self.done = False
+        self._condition = threading.Condition()
+
+    @classmethod
+    def completed(cls, text):
+        flight = cls()
+        flight.add(text)
+        flight.finish()
+        return flight
+
+    def add(self, text):
+        with self._condition:
+            if self.first_chunk_at is None:
+                self.first_chunk_at = time.perf_counter()
+            self.chunks.append(text)
+            self._condition.notify_all()
+
+    def finish(self, error=None):
+        with self._condition:
+            self.error = error
+            self.done = True
+            self._condition.notify_all()
+
+    def read(self):
+        """Yield every chunk from the first, blocking until more arrive or the call ends"""
+        position = 0
+        while True:
+            with self._condition:
+                while position >= len(self.chunks) and not self.done:
+                    self._condition.wait()
+                if position < len(self.chunks):
+                    chunk = self.chunks[position]
+                    position += 1
+                elif self.error is not None:
+                    raise self.error
+                else:
+                    return
+            yield chunk
+
+
+# Calls in progress by response cache key: identical requests wait on one call
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _read_cache(key, validate=None):
+    """Cached response for a key, or None; entries the validator rejects count as missing"""
+    try:
+        cache = response_cache.get_response_cache()
+        text = cache.get(key) if cache is not None else None
+    except Exception as e:
+        print(f"Error reading response cache: {e}")
+        return None
+    if text is not None and validate is not None and not validate(text):
+        return None
+    return text
+
+
+def _join_or_start(model, prompt, key, stream, timeout, validate=None):
+    """The flight answering this key; returns (flight, joined, cache_hit)
+
+    Joins the call in progress for the key if there is one. Otherwise the
+    cache is checked again under the lock, since a call may have landed
+    since the caller's own lookup, and only then is a new call started.
+    """
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        if flight is not None:
+            metrics.increment('llm.coalesced')
+            return flight, True, False
+        cached = _read_cache(key, validate)
+        if cached is not None:
+            return _Flight.completed(cached), False, True
+        flight = _Flight()
+        _inflight[key] = flight
+
+    started = time.perf_counter()
+    try:
+        future = get_client().submit(model, prompt, deadline=_deadline(timeout), stream=stream,
+                                     on_chunk=flight.add if stream else None)
+    except Exception:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        raise
+    future.add_done_callback(lambda done: _land(key, flight, stream, started, done, validate))
+    return flight, False, False
+
+
+def _land(key, flight, stream, started, future, validate=None):
+    """Finish a flight: record timings, fill the response cache, then release its readers
+
+    A response the validator rejects is not cached, so the next request asks again.
+    """
+    error = future.exception()
+    try:
+        if error is None:
+            text = future.result()
+            if not stream and text:
+                flight.add(text)
+            if flight.first_chunk_at is not None:
+                metrics.record('llm.ttft', flight.first_chunk_at - started)
+            metrics.record('llm.total', time.perf_counter() - started)
+            if text and text.strip() and (validate is None or validate(text)):
+                cache = response_cache.get_response_cache()
+                if cache is not None:
+                    cache.set(key, text)
+    except Exception as e:
+        print(f"Error writing response cache: {e}")
+    finally:
+        # The cache is filled before the flight is dropped: a request that finds no flight
+        # here finds the cached response when _join_or_start re-checks under the lock
+        with _inflight_lock:
+            if _inflight.get(key) is flight:
+                del _inflight[key]
+        flight.finish(error)
+
+
+class StreamedResponse:
+    """Iterate a model response chunk by chunk, serving and filling the response cache
+
+    Iterating yields text chunks as they arrive (a cached response arrives as
+    one chunk). Afterwards ``text`` holds the full response, ``cache_hit``
+    tells where it came from and ``timer`` has time-to-first-token and total
+    time; calls that reached the model also record them as ``llm.ttft`` /
+    ``llm.total`` metrics.
+
+    ``start()`` issues the call on the shared client right away, so the
+    caller can do other work (local scoring) while the model is generating.
+    Concurrent requests with the same key (a double click, several sessions
+    submitting the same pair) share one call instead of each issuing their
+    own: ``coalesced`` is True for those that joined a call in progress.
+
+    With ``validate(text)``, responses it rejects (e.g. malformed JSON) are
+    neither cached nor served from the cache, so a retry asks the model again.
+    """
+
+    def __init__(self, model, prompt, key, stream=True, timeout=None, validate=None):
+        self.model = model
+        self.prompt = prompt
+        self.key = key
+        self.stream = stream
+        self.timeout = timeout
+        self.validate = validate
+        self.text = None
+        self.cache_hit = False
+        self.coalesced = False
+        self.timer = None
+        self._flight = None
+
+    def start(self):
+        """Begin (or join) the model call in the background; iterating then reads its chunks"""
+        self.timer = GenerationTimer()
+        # Unlocked lookup first: cache hits are the common case and need no coordination
+        cached = _read_cache(self.key, self.validate)
+        if cached is not None:
+            self.cache_hit = True
+            self._flight = _Flight.completed(cached)
+        else:
+            self._flight, self.coalesced, self.cache_hit = _join_or_start(
+                self.model, self.prompt, self.key, self.stream, self.timeout, self.validate
+            )
+        return self
+
+    def __iter__(self):
+        if self._flight is None:
+            self.start()
+        parts = []
+        for chunk in self._flight.read():
+            if not parts:
+                # Chunks may have arrived while the caller was busy; time them from arrival
+                self.timer.mark_chunk(max(self._flight.first_chunk_at, self.timer.started))
+            parts.append(chunk)
+            yield chunk
+        self.timer.finish()
+        self.text = ''.join(parts)
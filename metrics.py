@@ -0,0 +1,75 @@
+"""In-process latency and counter metrics for the analysis pipeline.
+
+Samples are kept in bounded windows per metric name, so percentiles reflect
+recent traffic of this server process.
+"""
+import time
+import threading
+from collections import deque, Counter
+
+import numpy as np
+
+WINDOW = 1000
+
+
+class Metrics:
+    """Thread-safe latency windows and monotonic counters"""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._latencies = {}
+        self._counters = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._latencies.setdefault(name, deque(maxlen=self.window)).append(seconds)
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def count(self, name):
+        with self._lock:
+            return self._counters[name]
+
+    def summary(self, name):
+        """count, mean, p50, p95 and max of a latency metric in seconds, or None"""
+        with self._lock:
+            samples = np.array(self._latencies.get(name, ()))
+        if not len(samples):
+            return None
+        return {
+            'count': len(samples),
+            'mean': float(samples.mean()),
+            'p50': float(np.percentile(samples, 50)),
+            'p95': float(np.percentile(samples, 95)),
+            'max': float(samples.max()),
+        }
+
+
+metrics = Metrics()
+
+
+class GenerationTimer:
+    """Time to first token and total time of one streamed generation"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token_at = None
+        self.finished_at = None
+
+    def mark_chunk(self, at=None):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter() if at is None else at
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    @property
+    def ttft(self):
+        return None if self.first_token_at is None else self.first_token_at - self.started
+
+    @property
+    def total(self):
+        return None if self.finished_at is None else self.finished_at - self.started
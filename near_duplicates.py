@@ -0,0 +1,280 @@
+"""Near-duplicate resume detection with MinHash signatures and LSH banding.
+
+Each resume is reduced to the set of its word shingles (runs of consecutive
+normalised tokens) and summarised by a fixed-size MinHash signature, whose
+agreement rate estimates the Jaccard similarity of two shingle sets. The
+signature is cut into bands; documents sharing any band bucket become
+candidates, so finding the earlier versions of a resume costs a handful of
+indexed lookups however many resumes have been seen.
+
+Stored resumes belong to the user who uploaded them: lookups, diffs and
+reused results only ever see the same owner's documents.
+"""
+import os
+import json
+import time
+import zlib
+import hashlib
+import difflib
+import threading
+
+import numpy as np
+
+import app_config
+from sqlite_store import connect
+import resume_index
+from text_processing import as_analyzed
+
+# Bump when signatures or tables change, so stored data is discarded rather than misread
+SIGNATURE_VERSION = 3
+
+SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+SPLITMIX_M1 = np.uint64(0xBF58476D1CE4E5B9)
+SPLITMIX_M2 = np.uint64(0x94D049BB133111EB)
+
+META_SCHEMA = "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    name TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    text BLOB NOT NULL,
+    added_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    doc_id TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, doc_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS results (
+    doc_id TEXT NOT NULL,
+    jd_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    added_at INTEGER NOT NULL,
+    PRIMARY KEY (doc_id, jd_hash)
+) WITHOUT ROWID;
+"""
+
+
+def shingle_hashes(document, size=5):
+    """32-bit hashes of every run of `size` consecutive tokens"""
+    tokens = as_analyzed(document).tokens
+    if len(tokens) < size:
+        runs = [tokens] if tokens else []
+    else:
+        runs = (tokens[i:i + size] for i in range(len(tokens) - size + 1))
+    hashes = {zlib.crc32('\x1f'.join(run).encode('utf-8')) for run in runs}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def mix64(values):
+    """SplitMix64 finaliser: a bijective 64-bit mix (uint64 arithmetic wraps)"""
+    z = values + SPLITMIX_GAMMA
+    z = (z ^ (z >> np.uint64(30))) * SPLITMIX_M1
+    z = (z ^ (z >> np.uint64(27))) * SPLITMIX_M2
+    return z ^ (z >> np.uint64(31))
+
+
+class MinHasher:
+    """MinHash signatures from independent 64-bit mixing hashes, one per seed
+
+    Linear hashes (a * x + b) mod p with small multipliers order the shingles
+    almost the same way in every slot, which makes the slots correlated and
+    the Jaccard estimate far noisier than 1/sqrt(num_perm).
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.default_rng(seed)
+        self._seeds = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64,
+                                   endpoint=True)[:, None]
+        self.num_perm = num_perm
+
+    def signature(self, document, shingle_size=5):
+        hashes = shingle_hashes(document, shingle_size)
+        if not len(hashes):
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        permuted = mix64(mix64(hashes)[None, :] ^ self._seeds)
+        return (permuted.min(axis=1) >> np.uint64(32)).astype(np.uint32)
+
+
+def estimated_jaccard(first, second):
+    """Share of agreeing MinHash slots: an unbiased Jaccard estimate"""
+    return float(np.mean(first == second))
+
+
+def band_buckets(signature, bands):
+    """One signed 64-bit bucket id per band of the signature"""
+    rows = len(signature) // bands
+    return [
+        int.from_bytes(hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest(),
+                       'little', signed=True)
+        for band in range(bands)
+    ]
+
+
+def jd_hash(jd):
+    """Stable id of a job description: SHA-256 of its whitespace-normalised text"""
+    return hashlib.sha256(' '.join(as_analyzed(jd).text.split()).encode('utf-8')).hexdigest()
+
+
+def text_diff(previous, current, previous_name='previous', current_name='current'):
+    """Line diff between two extracted resume texts, as unified-diff text"""
+    return '\n'.join(difflib.unified_diff(
+        previous.splitlines(), current.splitlines(), fromfile=previous_name, tofile=current_name, lineterm=''
+    ))
+
+
+class DuplicateIndex:
+    """Persistent MinHash/LSH index of analyzed resumes (SQLite)
+
+    Keeps each resume's signature and compressed text (for diffs) plus the
+    analysis results produced for it, keyed by job description.
+    """
+
+    def __init__(self, path, num_perm=128, bands=16, shingle_size=5):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with connect(self.path) as conn:
+            conn.executescript(META_SCHEMA)
+            self._check_layout(conn)
+            conn.executescript(SCHEMA)
+
+    def _check_layout(self, conn):
+        layout = json.dumps([SIGNATURE_VERSION, self.hasher.num_perm, self.bands, self.shingle_size])
+        row = conn.execute("SELECT value FROM meta WHERE key = 'layout'").fetchone()
+        if row is None:
+            conn.execute("INSERT INTO meta (key, value) VALUES ('layout', ?)", (layout,))
+        elif row[0] != layout:
+            # Signatures of another layout are not comparable; start over
+            conn.execute("DROP TABLE IF EXISTS bands")
+            conn.execute("DROP TABLE IF EXISTS results")
+            conn.execute("DROP TABLE IF EXISTS documents")
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'layout'", (layout,))
+
+    def signature(self, document):
+        return self.hasher.signature(document, self.shingle_size)
+
+    def find(self, document, owner, threshold=0.85, signature=None):
+        """Owner's stored near-duplicates of a document as [(doc_id, name, jaccard)], most similar first"""
+        if signature is None:
+            signature = self.signature(document)
+        buckets = band_buckets(signature, self.bands)
+        with connect(self.path) as conn:
+            candidates = set()
+            for band, bucket in enumerate(buckets):
+                candidates.update(row[0] for row in conn.execute(
+                    "SELECT doc_id FROM bands JOIN documents USING (doc_id) "
+                    "WHERE band = ? AND bucket = ? AND owner = ?", (band, bucket, owner)
+                ))
+            matches = []
+            for doc_id in candidates:
+                name, stored = conn.execute(
+                    "SELECT name, signature FROM documents WHERE doc_id = ?", (doc_id,)
+                ).fetchone()
+                similarity = estimated_jaccard(signature, np.frombuffer(stored, dtype=np.uint32))
+                if similarity >= threshold:
+                    matches.append((doc_id, name, similarity))
+        return sorted(matches, key=lambda match: (-match[2], match[1]))
+
+    def add(self, document, name, owner, signature=None):
+        """Store an owner's resume signature and text; returns its doc id"""
+        document = as_analyzed(document)
+        doc_id = hashlib.sha256(f"{owner}\0{resume_index.document_id(document)}".encode('utf-8')).hexdigest()
+        if signature is None:
+            signature = self.signature(document)
+        with self._write_lock, connect(self.path) as conn:
+            exists = conn.execute("SELECT 1 FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+            if exists is None:
+                conn.execute(
+                    "INSERT INTO documents (doc_id, owner, name, signature, text, added_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (doc_id, owner, name, signature.tobytes(), zlib.compress(document.text.encode('utf-8')), int(time.time()))
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO bands (band, bucket, doc_id) VALUES (?, ?, ?)",
+                    [(band, bucket, doc_id) for band, bucket in enumerate(band_buckets(signature, self.bands))]
+                )
+        return doc_id
+
+    def text(self, doc_id, owner):
+        """Extracted text of one of the owner's stored resumes, or None"""
+        with connect(self.path) as conn:
+            row = conn.execute(
+                "SELECT text FROM documents WHERE doc_id = ? AND owner = ?", (doc_id, owner)
+            ).fetchone()
+        return None if row is None else zlib.decompress(row[0]).decode('utf-8')
+
+    def save_result(self, doc_id, jd, result):
+        """Remember the analysis of a stored resume against a job description"""
+        with self._write_lock, connect(self.path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (doc_id, jd_hash, result, added_at) VALUES (?, ?, ?, ?)",
+                (doc_id, jd_hash(jd), json.dumps(result), int(time.time()))
+            )
+
+    def result(self, doc_id, jd):
+        """Earlier analysis of a stored resume against the same job description, or None"""
+        with connect(self.path) as conn:
+            row = conn.execute(
+                "SELECT result FROM results WHERE doc_id = ? AND jd_hash = ?", (doc_id, jd_hash(jd))
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def __len__(self):
+        with connect(self.path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+
+def collapse_duplicates(documents, threshold=0.85, num_perm=128, bands=16):
+    """Group near-duplicate (name, document) pairs, keeping the first of each group
+
+    Returns (unique, duplicates): the kept pairs in their original order and a
+    list of (name, kept name, jaccard) for every collapsed submission.
+    """
+    hasher = MinHasher(num_perm)
+    buckets = [{} for _ in range(bands)]
+    kept_signatures = []
+    unique = []
+    duplicates = []
+    for name, document in documents:
+        signature = hasher.signature(document)
+        keys = band_buckets(signature, bands)
+        candidates = {buckets[band][key] for band, key in enumerate(keys) if key in buckets[band]}
+        best = max(
+            ((estimated_jaccard(signature, kept_signatures[i]), i) for i in candidates),
+            default=(0.0, None)
+        )
+        if best[1] is not None and best[0] >= threshold:
+            duplicates.append((name, unique[best[1]][0], best[0]))
+            continue
+        position = len(unique)
+        unique.append((name, document))
+        kept_signatures.append(signature)
+        for band, key in enumerate(keys):
+            buckets[band].setdefault(key, position)
+    return unique, duplicates
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_duplicate_index():
+    """Process-wide near-duplicate index, or None when detection is disabled"""
+    global _index
+    if not app_config.NEAR_DUPLICATE_DETECTION:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DuplicateIndex(app_config.NEAR_DUPLICATE_INDEX_PATH,
+                                        num_perm=app_config.MINHASH_PERMUTATIONS,
+                                        bands=app_config.MINHASH_BANDS)
+    return _index
@@ -0,0 +1,75 @@
+import queue
+import threading
+
+import pytesseract
+
+import app_config
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+class OCREngine:
+    """Bounded pool of warm OCR workers shared across Streamlit sessions
+
+    Each worker is an initialised in-process Tesseract API (tesserocr), so
+    the language model is loaded once instead of on every upload. Without
+    tesserocr OCR runs degraded: pytesseract forks the tesseract binary and
+    reloads the model on every call, and the pool only bounds how many of
+    those processes run at once.
+    """
+
+    def __init__(self, size=2, lang='eng'):
+        self.size = max(1, size)
+        self.lang = lang
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self.backend = 'tesserocr' if tesserocr is not None else 'pytesseract'
+        if tesserocr is None:
+            print("tesserocr is not installed (see requirements-ocr.txt): OCR falls back to one tesseract process per call (slower)")
+
+    def _acquire_api(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return tesserocr.PyTessBaseAPI(lang=self.lang)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get()
+
+    def image_to_string(self, image):
+        """Run OCR on a PIL image using a pooled worker"""
+        if self.backend == 'tesserocr':
+            try:
+                api = self._acquire_api()
+            except Exception as e:
+                print(f"tesserocr unavailable, falling back to one tesseract process per call (slower): {e}")
+                self.backend = 'pytesseract'
+            else:
+                try:
+                    api.SetImage(image)
+                    return api.GetUTF8Text()
+                finally:
+                    api.Clear()
+                    self._idle.put(api)
+
+        with self._slots:
+            return pytesseract.image_to_string(image, lang=self.lang)
+
+
+ocr_engine = OCREngine(size=app_config.OCR_POOL_SIZE, lang=app_config.OCR_LANG)
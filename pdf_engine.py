@@ -0,0 +1,168 @@
+import io
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyPDF2 import PdfReader
+from PIL import Image
+
+import app_config
+from image_preprocess import preprocess_image
+from ocr_engine import ocr_engine
+from extraction_cache import IncompleteText
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+# Glyphs PyPDF2 emits for fonts without a usable ToUnicode map
+_GARBAGE_PATTERN = re.compile(r'\(cid:\d+\)|[\ufffd\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Process pool shared by every session in this server process"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=app_config.PDF_WORKERS)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _extract_page_range(data, start, stop):
+    """Worker entry point: parse the PDF once and extract pages [start, stop)"""
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _page_ranges(page_count, workers):
+    chunk = -(-page_count // workers)
+    return [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+
+
+def page_needs_ocr(text):
+    """True when a page has no usable text layer (scanned or garbled)"""
+    stripped = text.strip()
+    if len(stripped) < app_config.PDF_MIN_TEXT_CHARS:
+        return True
+    garbage = sum(len(match) for match in _GARBAGE_PATTERN.findall(stripped))
+    readable = sum(1 for char in stripped if char.isalnum() or char.isspace())
+    return garbage > 0.2 * len(stripped) or readable < 0.6 * len(stripped)
+
+
+def _render_page(reader, document, index):
+    """Rasterize a page at the OCR target DPI, or pull its embedded scan"""
+    if document is not None:
+        scale = app_config.OCR_TARGET_DPI / 72.0
+        return document[index].render(scale=scale).to_pil()
+
+    # Without pdfium, fall back to the largest image embedded in the page,
+    # which for scanned resumes is the page scan itself.
+    images = [Image.open(io.BytesIO(image_file.data)) for image_file in reader.pages[index].images]
+    if not images:
+        return None
+    return max(images, key=lambda image: image.width * image.height)
+
+
+def _ocr_image(image):
+    return ocr_engine.image_to_string(preprocess_image(image))
+
+
+def ocr_missing_pages(data, reader, pages):
+    """OCR only the pages whose text layer is missing, in parallel
+
+    Returns (pages, failed): failed is True when rendering or OCR raised for any page.
+    """
+    missing = [index for index, text in enumerate(pages) if page_needs_ocr(text)]
+    if not missing:
+        return pages, False
+    failed = False
+
+    # pdfium is not thread-safe, so pages are rendered sequentially and only
+    # the OCR itself fans out across the shared OCR pool.
+    document = pypdfium2.PdfDocument(data) if pypdfium2 is not None else None
+    images = {}
+    try:
+        for index in missing:
+            try:
+                image = _render_page(reader, document, index)
+            except Exception as e:
+                print(f"Error rasterizing PDF page {index + 1}: {e}")
+                failed = True
+                image = None
+            if image is not None:
+                images[index] = image
+    finally:
+        if document is not None:
+            document.close()
+
+    if not images:
+        return pages, failed
+
+    pages = list(pages)
+    with ThreadPoolExecutor(max_workers=app_config.OCR_POOL_SIZE) as executor:
+        futures = {index: executor.submit(_ocr_image, image) for index, image in images.items()}
+        for index, future in futures.items():
+            try:
+                text = future.result()
+            except Exception as e:
+                print(f"Error performing OCR on PDF page {index + 1}: {e}")
+                failed = True
+                continue
+            if text.strip():
+                pages[index] = text
+    return pages, failed
+
+
+def extract_pdf_pages(data):
+    """Extract the text of every page, in page order; returns (pages, complete)"""
+    reader = PdfReader(io.BytesIO(data))
+    pages = _extract_text_layer(data, reader)
+    failed = False
+    if app_config.PDF_OCR_FALLBACK:
+        pages, failed = ocr_missing_pages(data, reader, pages)
+    return pages, not failed
+
+
+def _extract_text_layer(data, reader):
+    page_count = len(reader.pages)
+
+    if page_count < app_config.PDF_PARALLEL_MIN_PAGES or app_config.PDF_WORKERS < 2:
+        return [page.extract_text() or "" for page in reader.pages]
+
+    ranges = _page_ranges(page_count, app_config.PDF_WORKERS)
+    try:
+        pool = _get_pool()
+        futures = [pool.submit(_extract_page_range, data, start, stop) for start, stop in ranges]
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+    except BrokenProcessPool as e:
+        print(f"PDF worker pool failed, falling back to single-threaded extraction: {e}")
+        _reset_pool()
+        return [page.extract_text() or "" for page in reader.pages]
+
+
+def extract_pdf_text(file):
+    """Extract text from a PDF upload, parallelising long documents across processes"""
+    if hasattr(file, 'getvalue'):
+        data = file.getvalue()
+    else:
+        data = file.read()
+    pages, complete = extract_pdf_pages(data)
+    text = "\n".join(pages)
+    # Pages whose OCR failed (e.g. Tesseract missing) must not be cached as the document's text
+    return text if complete else IncompleteText(text)
@@ -0,0 +1,186 @@
+"""Compaction of the resume and job description before they enter a prompt.
+
+Extracted text carries OCR noise, repeated whitespace, duplicated headers and
+footers, and job postings add boilerplate (equal-opportunity statements,
+benefits, company blurbs) that does not help the analysis. This stage cleans
+both inputs, drops repeated lines and boilerplate, and if the result is still
+over the token budget keeps sections in priority order (requirements and
+skills before company blurbs and hobbies) until the budget is spent.
+"""
+import re
+import math
+import unicodedata
+from collections import namedtuple
+
+import skill_matcher
+from text_processing import tokenize, is_term
+
+COMPACTION_VERSION = 'compact-3'
+
+# Only lines at least this long are de-duplicated: repeated page headers and footers and
+# copy-pasted bullets, not short lines such as a job title held twice
+DEDUPE_MIN_CHARS = 40
+
+# Share of the budget reserved for the job description; unused room goes to the resume
+JD_BUDGET_SHARE = 0.35
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+CONTROL_CHARACTERS = re.compile(r"[\u0000-\u0008\u000b-\u001f\u007f-\u009f\u200b-\u200f\ufeff]")
+SPACES = re.compile(r"[ \t]+")
+PAGE_MARKERS = re.compile(r"^(page\s*)?\d+\s*(of|/)\s*\d+$|^page\s*\d+$", re.IGNORECASE)
+BULLET = re.compile(r"^[-*•▪◦●·>\d]")
+MARKDOWN_HEADING = re.compile(r"^(#{1,6}\s+\S.*|\*\*[^*]+\*\*:?|__[^_]+__:?)$")
+
+# Lines of the job description dropped wherever they appear: EEO and legal statements only,
+# anything that could state a requirement stays
+BOILERPLATE_PATTERNS = re.compile(
+    r"equal (employment )?opportunity|\beeo\b|affirmative action|without regard to (race|age|religion)"
+    r"|reasonable accommodation|protected veteran|e-verify|privacy (notice|policy)"
+    r"|drug[- ]free workplace|we are an equal",
+    re.IGNORECASE
+)
+
+# Section headings -> priority (lower keeps first); unknown sections are 2
+SECTION_PRIORITIES = [
+    (re.compile(r"requirement|qualification|must have|what you.ll need|what we.re looking for|skills|technolog|tech stack|competenc", re.I), 0),
+    (re.compile(r"responsibilit|what you.ll do|the role|duties|experience|employment|work history", re.I), 1),
+    (re.compile(r"summary|profile|objective|projects?|education|certification", re.I), 2),
+    (re.compile(r"nice to have|preferred|bonus|publications|awards|languages", re.I), 3),
+    (re.compile(r"about (us|the company|the team)|who we are|our (mission|culture|values)|company overview", re.I), 4),
+    (re.compile(r"benefits|perks|what we offer|compensation|salary|pay range|how to apply|hobbies|interests|references", re.I), 5),
+]
+DEFAULT_PRIORITY = 2
+# Job description sections (benefits, how to apply) dropped along with the boilerplate;
+# only a heading with an explicit marker can start one
+BOILERPLATE_PRIORITY = 5
+
+Compacted = namedtuple('Compacted', ['text', 'original_tokens', 'tokens'])
+
+
+def count_tokens(text):
+    """Offline estimate of model tokens: words and punctuation, long words in ~4-character pieces"""
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in TOKEN_PATTERN.findall(text))
+
+
+def _is_noise(line):
+    """OCR debris: lines with hardly any letters or digits ("|||", "~ ~ ._")
+
+    A line holding a recognised term or skill ("C++", "C#", "R") is never noise.
+    """
+    useful = sum(ch.isalnum() for ch in line)
+    if useful >= 2 and useful >= 0.4 * len(line.replace(' ', '')):
+        return False
+    if any(is_term(token) for token in tokenize(line)):
+        return False
+    return not skill_matcher.match_skills(line).counts
+
+
+def clean_lines(text):
+    """Normalised, de-noised, de-duplicated non-empty lines"""
+    text = CONTROL_CHARACTERS.sub('', unicodedata.normalize('NFKC', text))
+    lines = []
+    seen = set()
+    for line in text.splitlines():
+        line = SPACES.sub(' ', line).strip()
+        if not line or _is_noise(line) or PAGE_MARKERS.match(line):
+            continue
+        # Repeated headers, footers and copy-pasted bullets are sent once
+        key = line.casefold()
+        if key in seen and len(line) >= DEDUPE_MIN_CHARS:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+
+def _heading_priority(line):
+    """Priority of a section heading line, or None when the line is not a heading
+
+    A heading is marked (trailing colon, all caps, markdown heading or bold
+    line) or a short line naming a known section. Unmarked lines never start
+    a boilerplate section: "Great benefits" may well be followed by the
+    requirements.
+    """
+    markdown = MARKDOWN_HEADING.match(line)
+    words = line.strip('#*_: ').split()
+    if not words or len(words) > 6 or line.endswith('.') or (BULLET.match(line) and not markdown):
+        return None
+    marked = bool(markdown) or line.endswith(':') or line.isupper()
+    if not marked and len(words) > 4:
+        return None
+    for pattern, priority in SECTION_PRIORITIES:
+        if pattern.search(line):
+            if not marked and priority >= BOILERPLATE_PRIORITY:
+                return None
+            return priority
+    return DEFAULT_PRIORITY if marked else None
+
+
+def split_sections(lines):
+    """Group lines into (priority, lines) sections at every recognised heading"""
+    sections = [(DEFAULT_PRIORITY, [])]
+    for line in lines:
+        priority = _heading_priority(line)
+        if priority is not None:
+            sections.append((priority, []))
+        sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+
+def _fit(sections, budget):
+    """Lines of every section kept within the budget, filling sections by priority"""
+    line_tokens = [[count_tokens(line) for line in lines] for _, lines in sections]
+    keep = [[] for _ in sections]
+    remaining = budget
+    for index in sorted(range(len(sections)), key=lambda i: (sections[i][0], i)):
+        kept = []
+        for line, tokens in zip(sections[index][1], line_tokens[index]):
+            if tokens > remaining:
+                break
+            kept.append(line)
+            remaining -= tokens
+        # A heading without any of its content is not worth its tokens
+        if index > 0 and len(kept) == 1 and len(sections[index][1]) > 1:
+            remaining += line_tokens[index][0]
+            kept = []
+        keep[index] = kept
+    return [(priority, kept) for (priority, _), kept in zip(sections, keep)]
+
+
+def compact_text(text, budget=None, drop_boilerplate=False):
+    """Cleaned text fitting the token budget, keeping the most important sections"""
+    original_tokens = count_tokens(text)
+    sections = split_sections(clean_lines(text))
+    if drop_boilerplate:
+        sections = [
+            (priority, [line for line in lines if not BOILERPLATE_PATTERNS.search(line)])
+            for priority, lines in sections if priority != BOILERPLATE_PRIORITY
+        ]
+    if budget is not None and sum(count_tokens(line) for _, lines in sections for line in lines) > budget:
+        sections = _fit(sections, budget)
+
+    compacted = '\n'.join(line for _, lines in sections for line in lines)
+    return Compacted(compacted, original_tokens, count_tokens(compacted))
+
+
+def compact_inputs(jd, resume, budget):
+    """Compact both prompt inputs to share a token budget
+
+    Returns (jd, resume, report) where report has the original and compacted
+    token counts and the tokens saved.
+    """
+    compact_jd = compact_text(jd, int(budget * JD_BUDGET_SHARE), drop_boilerplate=True)
+    compact_resume = compact_text(resume, budget - compact_jd.tokens)
+    original = compact_jd.original_tokens + compact_resume.original_tokens
+    compacted = compact_jd.tokens + compact_resume.tokens
+    report = {
+        'original_tokens': original,
+        'tokens': compacted,
+        'tokens_saved': original - compacted,
+    }
+    return compact_jd.text, compact_resume.text, report
+
+
+def versioned(prompt_version, budget):
+    """Prompt version for cache keys, so differently compacted inputs never share entries"""
+    return f"{prompt_version}/{COMPACTION_VERSION}@{budget}"
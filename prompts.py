@@ -0,0 +1,119 @@
+"""Prompt templates sent to the language model.
+
+Every template carries a version that is part of the response cache key:
+bump it whenever the wording changes, so answers to the old prompt are
+never served for the new one.
+"""
+
+ATS_PROMPT_VERSION = 'ats-1'
+ATS_PROMPT = """
+You are a skilled and very experienced ATS (Application Tracking System) with a deep understanding of tech fields, software engineering,
+data science, data analysis, and big data engineering. Your task is to evaluate the resume based on the given job description.
+You must consider the job market is very competitive and you should provide the best assistance for improving the resumes.
+Assign the percentage Matching based on Job description and the missing keywords with high accuracy.
+Resume: {extracted_text}
+Description: {jd}
+
+I want the only response in 3 sectors as follows:
+• Job Description Match: \n
+• Missing Keywords: \n
+• Profile Summary: \n
+"""
+
+ANALYSIS_PROMPT_VERSION = 'analysis-1'
+ANALYSIS_PROMPT = """
+You are an expert ATS (Application Tracking System) analyzer and career counselor.
+Analyze the following resume against the job description with high precision.
+
+Job Description:
+{jd}
+
+Resume Content:
+{extracted_text}
+
+Please provide a detailed analysis in the following format:
+
+**MATCH PERCENTAGE:** [Provide exact percentage 0-100]
+
+**KEY STRENGTHS:**
+• [List 3-5 key matching strengths]
+
+**MISSING KEYWORDS:**
+• [List 5-10 important missing keywords from job description]
+
+**IMPROVEMENT RECOMMENDATIONS:**
+• [Provide 3-5 specific actionable recommendations]
+
+**SKILLS GAP ANALYSIS:**
+• [Identify skill gaps and suggest improvements]
+
+**OVERALL ASSESSMENT:**
+[Provide comprehensive feedback and next steps]
+"""
+
+# Fan-out mode: one short request per section of ANALYSIS_PROMPT, run concurrently.
+# Each section is cached on its own, keyed with its own version, so rewording one
+# section only invalidates that section.
+SECTION_PROMPT_VERSION = 'section-1'
+SECTION_PROMPT = """
+You are an expert ATS (Application Tracking System) analyzer and career counselor.
+Analyze the following resume against the job description with high precision.
+
+Job Description:
+{jd}
+
+Resume Content:
+{extracted_text}
+
+Write only the {title} section of the analysis, without a heading:
+{instruction}
+"""
+
+# (title, instruction, version) in rendering order
+ANALYSIS_SECTIONS = [
+    ('MATCH PERCENTAGE', '[Provide exact percentage 0-100]', '1'),
+    ('KEY STRENGTHS', '• [List 3-5 key matching strengths]', '1'),
+    ('MISSING KEYWORDS', '• [List 5-10 important missing keywords from job description]', '1'),
+    ('IMPROVEMENT RECOMMENDATIONS', '• [Provide 3-5 specific actionable recommendations]', '1'),
+    ('SKILLS GAP ANALYSIS', '• [Identify skill gaps and suggest improvements]', '1'),
+    ('OVERALL ASSESSMENT', '[Provide comprehensive feedback and next steps]', '1'),
+]
+
+# Quick scan: a short verdict from a faster model, shown next to the local scores
+QUICK_PROMPT_VERSION = 'quick-1'
+QUICK_PROMPT = """
+You are an expert ATS (Application Tracking System) screener.
+
+Job Description:
+{jd}
+
+Resume Content:
+{extracted_text}
+
+Write only the QUICK SUMMARY section of the analysis, without a heading:
+[In at most 4 sentences, say how well the resume fits the job description and name the single most important improvement]
+"""
+
+# Structured output: the same analysis as one JSON object (see structured_analysis.SCHEMA),
+# so its fields can be stored, compared and aggregated without asking the model again
+STRUCTURED_PROMPT_VERSION = 'structured-1'
+STRUCTURED_PROMPT = """
+You are an expert ATS (Application Tracking System) analyzer and career counselor.
+Analyze the following resume against the job description with high precision.
+
+Job Description:
+{jd}
+
+Resume Content:
+{extracted_text}
+
+Respond with only a JSON object, without code fences or any other text, in this format:
+{{
+  "match_percentage": <integer 0-100>,
+  "strengths": [<3-5 key matching strengths>],
+  "missing_keywords": [<5-10 important missing keywords from the job description>],
+  "recommendations": [<3-5 specific actionable recommendations>],
+  "skills_gaps": [<skill gaps, each with a suggested improvement>],
+  "overall_assessment": "<comprehensive feedback and next steps>"
+}}
+"""
@@ -0,0 +1,114 @@
+"""Persistent cache of language model responses.
+
+Entries are keyed on the whitespace-normalised resume and job description,
+the prompt template version and the model name, and stored zlib-compressed
+in SQLite with a time-to-live and a total size limit (least recently used
+entries are evicted first).
+"""
+import os
+import time
+import zlib
+import hashlib
+import threading
+
+import app_config
+from sqlite_store import connect
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_by_access ON responses (accessed_at);
+"""
+
+
+def response_key(resume, jd, prompt_version, model_name):
+    """SHA-256 of the normalised inputs, prompt version and model name"""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model_name, ' '.join(jd.split()), ' '.join(resume.split())):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL and size-based LRU eviction"""
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._write_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with connect(self.path) as conn:
+            conn.executescript(SCHEMA)
+
+    def get(self, key):
+        """Cached response text, or None when missing or expired"""
+        now = time.time()
+        with connect(self.path) as conn:
+            row = conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def set(self, key, text):
+        value = zlib.compress(text.encode('utf-8'))
+        now = time.time()
+        with self._write_lock, connect(self.path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        """Drop expired entries, then least recently used ones down to 90% of the size limit"""
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        usage = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if usage <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if usage <= target:
+                break
+            victims.append((key,))
+            usage -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def __len__(self):
+        with connect(self.path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Process-wide response cache, or None when caching is disabled"""
+    global _cache
+    if not app_config.RESPONSE_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(app_config.RESPONSE_CACHE_PATH,
+                                       ttl_seconds=app_config.RESPONSE_CACHE_TTL_SECONDS,
+                                       max_bytes=app_config.RESPONSE_CACHE_BYTES)
+    return _cache
+
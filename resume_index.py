@@ -0,0 +1,158 @@
+import os
+import math
+import time
+import hashlib
+import threading
+
+import app_config
+from sqlite_store import connect
+import ann_index
+import scoring_model
+from text_processing import as_analyzed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    norm REAL NOT NULL,
+    added_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_doc ON postings (doc_id);
+"""
+
+
+def document_id(document):
+    """Stable id of a resume: SHA-256 of its whitespace-normalised text"""
+    text = as_analyzed(document).text
+    return hashlib.sha256(' '.join(text.split()).encode('utf-8')).hexdigest()
+
+
+def term_weights(document, model=None):
+    """Log-scaled TF-IDF weight of every term, using the shared tokenizer"""
+    model = model or scoring_model.get_scoring_model()
+    weights = {}
+    for term, count in as_analyzed(document).counts.items():
+        idf = model.term_weight(term)
+        if idf > 0:
+            weights[term] = (1.0 + math.log(count)) * idf
+    return weights
+
+
+class ResumeIndex:
+    """Inverted index of stored resumes on local disk (SQLite)
+
+    Each document stores its postings (term, weight) and a precomputed vector
+    norm, so a query only reads the postings lists of its own terms and the
+    cosine score needs no pass over the rest of the corpus.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with connect(self.path) as conn:
+            conn.executescript(SCHEMA)
+            self._check_model(conn)
+
+    def _check_model(self, conn):
+        fingerprint = scoring_model.get_scoring_model().fingerprint
+        row = conn.execute("SELECT value FROM meta WHERE key = 'model'").fetchone()
+        if row is None:
+            conn.execute("INSERT INTO meta (key, value) VALUES ('model', ?)", (fingerprint,))
+        elif row[0] != fingerprint:
+            print("Resume index was built with a different scoring model; re-index for consistent scores")
+
+    def add(self, document, name):
+        """Index a resume, as text or AnalyzedText, replacing any previous copy; returns its doc id"""
+        document = as_analyzed(document)
+        doc_id = document_id(document)
+        weights = term_weights(document)
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if norm == 0:
+            return doc_id
+        with self._write_lock, connect(self.path) as conn:
+            conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (doc_id, name, norm, added_at) VALUES (?, ?, ?, ?)",
+                (doc_id, name, norm, int(time.time()))
+            )
+            conn.executemany(
+                "INSERT INTO postings (term, doc_id, weight) VALUES (?, ?, ?)",
+                [(term, doc_id, weight) for term, weight in weights.items()]
+            )
+        return doc_id
+
+    def remove(self, doc_id):
+        """Delete a resume and its postings from the index"""
+        with self._write_lock, connect(self.path) as conn:
+            conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+            deleted = conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,)).rowcount
+        return deleted > 0
+
+    def __len__(self):
+        with connect(self.path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def search(self, jd, k=10):
+        """Top-k stored resumes by cosine similarity to the job description
+
+        Returns a list of (doc_id, name, score) with score in [0, 1].
+        """
+        weights = term_weights(jd)
+        query_norm = math.sqrt(sum(w * w for w in weights.values()))
+        if query_norm == 0:
+            return []
+        with connect(self.path) as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS query_terms (term TEXT PRIMARY KEY, weight REAL)")
+            conn.execute("DELETE FROM query_terms")
+            conn.executemany("INSERT INTO query_terms (term, weight) VALUES (?, ?)", weights.items())
+            rows = conn.execute(
+                """
+                SELECT d.doc_id, d.name, SUM(p.weight * q.weight) / d.norm AS score
+                FROM query_terms q
+                JOIN postings p ON p.term = q.term
+                JOIN documents d ON d.doc_id = p.doc_id
+                GROUP BY d.doc_id
+                ORDER BY score DESC
+                LIMIT ?
+                """,
+                (k,)
+            ).fetchall()
+        return [(doc_id, name, score / query_norm) for doc_id, name, score in rows]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_resume_index():
+    """Process-wide resume index, or None when indexing is disabled"""
+    global _index
+    if not app_config.RESUME_INDEX_ENABLED:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ResumeIndex(app_config.RESUME_INDEX_PATH)
+    return _index
+
+
+def index_resume(document, name):
+    """Add an extracted resume to the inverted and semantic indexes, never failing the caller"""
+    doc_id = None
+    try:
+        index = get_resume_index()
+        if index is None:
+            return None
+        doc_id = index.add(document, name)
+        ann_index.add_documents([doc_id], [name], [document])
+    except Exception as e:
+        print(f"Error indexing resume: {e}")
+    return doc_id
@@ -0,0 +1,166 @@
+"""Pre-fitted TF-IDF scoring model.
+
+The IDF table is computed offline from a local corpus of job descriptions and
+resumes and loaded once per process, so scoring a request only transforms the
+two texts. Build a model with:
+
+    python scoring_model.py build path/to/corpus --out models
+
+The corpus is any directory tree of ``.txt`` files (one document per file).
+Without a model on disk, scoring falls back to a stateless hashing vectorizer.
+"""
+import os
+import argparse
+import threading
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+import app_config
+from text_processing import as_analyzed, extract_terms
+
+VOCAB_FILE = 'idf_vocab.txt'
+WEIGHTS_FILE = 'idf_weights.npy'
+
+
+class IdfScoringModel:
+    """TF-IDF with a fixed vocabulary and precomputed IDF weights"""
+
+    kind = 'idf'
+
+    def __init__(self, terms, idf):
+        self.terms = terms
+        self.idf = idf
+        self.vocabulary = {term: index for index, term in enumerate(terms)}
+        self.max_idf = float(np.max(idf)) if len(idf) else 1.0
+
+    def transform(self, documents):
+        """L2-normalised TF-IDF rows for texts or AnalyzedTexts (sparse CSR)"""
+        indptr, indices, data = [0], [], []
+        for document in documents:
+            for term, count in as_analyzed(document).counts.items():
+                index = self.vocabulary.get(term)
+                if index is not None:
+                    indices.append(index)
+                    data.append(count)
+            indptr.append(len(indices))
+        counts = csr_matrix((np.asarray(data, dtype=np.float64), indices, indptr),
+                            shape=(len(indptr) - 1, len(self.terms)))
+        return normalize(counts.multiply(self.idf).tocsr())
+
+    def feature_names(self, indices):
+        return [self.terms[i] for i in indices]
+
+    def term_weight(self, term):
+        """IDF of a term, or 0 for terms outside the vocabulary"""
+        index = self.vocabulary.get(term)
+        return 0.0 if index is None else float(self.idf[index])
+
+    @property
+    def fingerprint(self):
+        return f"idf:{len(self.terms)}:{float(np.sum(self.idf)):.6f}"
+
+
+class HashingScoringModel:
+    """Stateless fallback used when no IDF model file is present"""
+
+    kind = 'hashing'
+    max_idf = 1.0
+
+    def __init__(self, n_features=2 ** 18):
+        self.n_features = n_features
+        self._hasher = FeatureHasher(n_features=n_features, input_type='dict', alternate_sign=False)
+
+    def transform(self, documents):
+        counts = self._hasher.transform(as_analyzed(document).counts for document in documents)
+        return normalize(counts.tocsr())
+
+    def feature_names(self, indices):
+        return [f"#{i}" for i in indices]
+
+    def term_weight(self, term):
+        return 1.0
+
+    @property
+    def fingerprint(self):
+        return f"hashing:{self.n_features}"
+
+
+def load_scoring_model(model_dir):
+    """Load a saved IDF model, memory-mapping the weights"""
+    with open(os.path.join(model_dir, VOCAB_FILE), 'r', encoding='utf-8') as f:
+        terms = f.read().split('\n')
+    idf = np.load(os.path.join(model_dir, WEIGHTS_FILE), mmap_mode='r')
+    if len(terms) != len(idf):
+        raise ValueError(f"Vocabulary ({len(terms)}) and IDF table ({len(idf)}) sizes differ")
+    return IdfScoringModel(terms, idf)
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_scoring_model():
+    """Process-wide scoring model, loaded on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                try:
+                    _model = load_scoring_model(app_config.MODEL_DIR)
+                except FileNotFoundError:
+                    _model = HashingScoringModel()
+                except Exception as e:
+                    print(f"Error loading scoring model, using hashing fallback: {e}")
+                    _model = HashingScoringModel()
+    return _model
+
+
+def similarity(jd, resume):
+    """Cosine similarity of two documents (texts or AnalyzedTexts) under the process-wide model"""
+    vectors = get_scoring_model().transform([jd, resume])
+    return float(vectors[0].multiply(vectors[1]).sum())
+
+
+def read_corpus(corpus_dir):
+    """Yield the text of every .txt file under a corpus directory"""
+    for root, _, files in os.walk(corpus_dir):
+        for name in sorted(files):
+            if name.endswith('.txt'):
+                with open(os.path.join(root, name), 'r', encoding='utf-8', errors='ignore') as f:
+                    yield f.read()
+
+
+def build_model(corpus_dir, out_dir, min_df=2, max_features=200000):
+    """Fit document frequencies on a local corpus and save the IDF table"""
+    counter = CountVectorizer(analyzer=extract_terms, binary=True,
+                              min_df=min_df, max_features=max_features, dtype=np.int32)
+    presence = counter.fit_transform(read_corpus(corpus_dir))
+    n_documents = presence.shape[0]
+    df = np.asarray(presence.sum(axis=0)).ravel()
+    # Same smoothing as sklearn's TfidfTransformer(smooth_idf=True)
+    idf = (np.log((1 + n_documents) / (1 + df)) + 1).astype(np.float32)
+
+    terms = counter.get_feature_names_out()
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, VOCAB_FILE), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(terms))
+    np.save(os.path.join(out_dir, WEIGHTS_FILE), idf)
+    return n_documents, len(terms)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    build = subcommands.add_parser('build', help='fit an IDF model on a corpus of .txt files')
+    build.add_argument('corpus_dir')
+    build.add_argument('--out', default=app_config.MODEL_DIR)
+    build.add_argument('--min-df', type=int, default=2)
+    build.add_argument('--max-features', type=int, default=200000)
+    args = parser.parse_args()
+
+    documents, vocabulary = build_model(args.corpus_dir, args.out, args.min_df, args.max_features)
+    print(f"Built IDF model from {documents} documents, {vocabulary} terms -> {args.out}")
@@ -0,0 +1,124 @@
+"""Offline semantic similarity via an LSA (truncated SVD) projection.
+
+The projection is trained from the same local corpus as the IDF model and
+shipped as a NumPy file that is memory-mapped at load. Scoring projects the
+TF-IDF rows of the job description and any number of resumes in one batched
+matrix multiply, so "built REST APIs" and "backend web services" can score
+as related without a network call or a GPU. Train it with:
+
+    python scoring_model.py build path/to/corpus --out models
+    python semantic_model.py build path/to/corpus --out models
+"""
+import os
+import argparse
+import threading
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+
+import app_config
+import scoring_model
+
+PROJECTION_FILE = 'lsa_projection.npy'
+
+
+class LsaModel:
+    """Projects TF-IDF vectors onto the top latent semantic components"""
+
+    def __init__(self, projection, scorer):
+        self.projection = projection  # (n_components, vocabulary size)
+        self.scorer = scorer
+
+    def project(self, tfidf):
+        """Unit-length LSA vectors for TF-IDF rows, in one matrix multiply"""
+        vectors = np.asarray(tfidf @ self.projection.T, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def embed(self, documents):
+        """Unit-length LSA vectors for texts or AnalyzedTexts, one row each"""
+        return self.project(self.scorer.transform(documents))
+
+    def scores_from_tfidf(self, tfidf):
+        """Semantic scores of rows 1.. against row 0 of a TF-IDF matrix"""
+        vectors = self.project(tfidf)
+        return np.clip(vectors[1:] @ vectors[0], 0.0, 1.0)
+
+    def scores(self, jd, resumes):
+        """Cosine similarity in LSA space of every resume against the JD"""
+        return self.scores_from_tfidf(self.scorer.transform([jd] + list(resumes)))
+
+
+_model = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def get_semantic_model():
+    """Process-wide LSA model, or None when no projection has been trained"""
+    global _model, _model_loaded
+    if not _model_loaded:
+        with _model_lock:
+            if not _model_loaded:
+                _model = _load(app_config.MODEL_DIR)
+                _model_loaded = True
+    return _model
+
+
+def _load(model_dir):
+    path = os.path.join(model_dir, PROJECTION_FILE)
+    if not os.path.exists(path):
+        return None
+    scorer = scoring_model.get_scoring_model()
+    if scorer.kind != 'idf':
+        print("LSA projection found but no IDF model; semantic scoring disabled")
+        return None
+    try:
+        projection = np.load(path, mmap_mode='r')
+    except Exception as e:
+        print(f"Error loading LSA projection: {e}")
+        return None
+    if projection.shape[1] != len(scorer.terms):
+        print("LSA projection does not match the IDF vocabulary; semantic scoring disabled")
+        return None
+    return LsaModel(projection, scorer)
+
+
+def semantic_scores(jd, resumes):
+    """Batched semantic scores in [0, 1], or None when no model is available"""
+    model = get_semantic_model()
+    if model is None:
+        return None
+    return model.scores(jd, resumes)
+
+
+def semantic_similarity(jd, resume):
+    """Semantic score of one resume, or None when no model is available"""
+    scores = semantic_scores(jd, [resume])
+    return None if scores is None else float(scores[0])
+
+
+def build_projection(corpus_dir, out_dir, n_components=128):
+    """Fit a truncated SVD on the corpus TF-IDF matrix and save its components"""
+    scorer = scoring_model.load_scoring_model(out_dir)
+    texts = list(scoring_model.read_corpus(corpus_dir))
+    tfidf = scorer.transform(texts)
+    n_components = min(n_components, tfidf.shape[1] - 1, tfidf.shape[0] - 1)
+    svd = TruncatedSVD(n_components=n_components, algorithm='randomized', random_state=0)
+    svd.fit(tfidf)
+    np.save(os.path.join(out_dir, PROJECTION_FILE), svd.components_.astype(np.float32))
+    return n_components, float(svd.explained_variance_ratio_.sum())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    build = subcommands.add_parser('build', help='train the LSA projection on a corpus of .txt files')
+    build.add_argument('corpus_dir')
+    build.add_argument('--out', default=app_config.MODEL_DIR)
+    build.add_argument('--components', type=int, default=128)
+    args = parser.parse_args()
+
+    components, explained = build_projection(args.corpus_dir, args.out, args.components)
+    print(f"Built LSA projection with {components} components ({explained:.1%} variance) -> {args.out}")
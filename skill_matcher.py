@@ -0,0 +1,157 @@
+"""Multi-word skill and synonym matching for keyword analysis.
+
+The skill dictionary (``data/skills.json`` by default) lists canonical skill
+names with their aliases. Every phrase is tokenized with the shared tokenizer
+and compiled into an Aho-Corasick automaton over tokens, so a document is
+matched against the whole dictionary in a single linear pass regardless of how
+many skills it holds. Matching on token boundaries means "go" never matches
+inside "google" and "k8s" resolves to "Kubernetes".
+
+Matching ignores case, except for the names of entries marked
+``"case_sensitive": true``: short names that are also ordinary words or
+letters ("Go", "C", "R") only match as written, so "go above and beyond" or
+"plan C" is not a skill. Their aliases ("golang") still match in any case.
+"""
+import json
+import threading
+import functools
+from collections import deque, namedtuple, Counter
+
+import app_config
+from text_processing import as_analyzed, tokenize, cased_tokens
+
+SkillMatches = namedtuple('SkillMatches', ['counts', 'first_position', 'covered_tokens'])
+
+
+class SkillAutomaton:
+    """Aho-Corasick automaton whose alphabet is tokens rather than characters"""
+
+    def __init__(self, skills):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self.canonical_names = []
+        self.longest_phrase = 0
+        for name, aliases, case_sensitive in skills:
+            skill_id = len(self.canonical_names)
+            self.canonical_names.append(name)
+            for phrase in [name] + list(aliases):
+                tokens = tokenize(phrase)
+                if tokens:
+                    cased = tuple(cased_tokens(phrase) or ()) if case_sensitive and phrase == name else None
+                    self._add(tokens, skill_id, cased)
+        self._build_failure_links()
+
+    def _add(self, tokens, skill_id, cased=None):
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][token] = next_state
+            state = next_state
+        self.longest_phrase = max(self.longest_phrase, len(tokens))
+        if (skill_id, len(tokens), cased) not in self._output[state]:
+            self._output[state].append((skill_id, len(tokens), cased))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def iter_matches(self, tokens, cased=None):
+        """Yield (skill_id, start, end) for every dictionary phrase in the token sequence
+
+        ``cased`` holds the same tokens in their original case; without it
+        case-sensitive phrases never match.
+        """
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for position, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for skill_id, length, phrase in output[state]:
+                start = position - length + 1
+                if phrase is not None and (cased is None or tuple(cased[start:position + 1]) != phrase):
+                    continue
+                yield skill_id, start, position + 1
+
+    def _outermost(self, matches):
+        """Drop matches lying inside a longer match of another skill ("c" in "c sharp")"""
+        by_start = {}
+        for skill_id, start, end in matches:
+            by_start.setdefault(start, []).append((end, skill_id))
+        kept = []
+        for skill_id, start, end in matches:
+            inside = any(
+                other != skill_id and other_end >= end and other_end - other_start > end - start
+                for other_start in range(max(0, end - self.longest_phrase), start + 1)
+                for other_end, other in by_start.get(other_start, ())
+            )
+            if not inside:
+                kept.append((skill_id, start, end))
+        return kept
+
+    def match(self, tokens, cased=None):
+        counts = Counter()
+        first_position = {}
+        covered = set()
+        last_end = {}
+        for skill_id, start, end in self._outermost(list(self.iter_matches(tokens, cased))):
+            covered.update(tokens[start:end])
+            # Overlapping phrases of one skill ("ci/cd" inside "ci/cd pipelines") count once
+            if start < last_end.get(skill_id, 0):
+                continue
+            last_end[skill_id] = end
+            name = self.canonical_names[skill_id]
+            counts[name] += 1
+            first_position.setdefault(name, start)
+        return SkillMatches(counts, first_position, frozenset(covered))
+
+
+def load_skills(path):
+    """Read (name, aliases, case_sensitive) entries from a JSON skill dictionary"""
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    return [(entry['name'], entry.get('aliases', []), entry.get('case_sensitive', False)) for entry in entries]
+
+
+_automaton = None
+_automaton_lock = threading.Lock()
+
+
+def get_skill_automaton():
+    """Process-wide automaton compiled from the skill dictionary on first use"""
+    global _automaton
+    if _automaton is None:
+        with _automaton_lock:
+            if _automaton is None:
+                try:
+                    skills = load_skills(app_config.SKILLS_DICTIONARY_PATH)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Error loading skill dictionary: {e}")
+                    skills = []
+                _automaton = SkillAutomaton(skills)
+    return _automaton
+
+
+@functools.lru_cache(maxsize=64)
+def _match_text(text):
+    return get_skill_automaton().match(as_analyzed(text).tokens, cased_tokens(text))
+
+
+def match_skills(document):
+    """Canonical skills mentioned in a document (text or AnalyzedText)"""
+    return _match_text(as_analyzed(document).text)
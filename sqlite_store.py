@@ -0,0 +1,16 @@
+"""SQLite connections shared by the on-disk stores (response cache, resume index, near-duplicates)."""
+import sqlite3
+from contextlib import contextmanager
+
+
+@contextmanager
+def connect(path):
+    """Short-lived connection committing on success; SQLite handles are per-thread"""
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        with conn:
+            yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,151 @@
+"""Structured (JSON) AI analysis: schema, parser and rendering helpers.
+
+The structured prompt asks the model for one JSON object with the fields in
+SCHEMA. ``parse_analysis`` tries ``json.loads`` on the response first and
+only falls back to repairing it (code fences, surrounding prose, trailing
+commas, typographic quotes) when that fails; either way the result is
+validated and coerced to the schema, so callers can rely on the field types.
+"""
+import re
+import json
+
+from metrics import metrics
+
+# field -> type; every field is required
+SCHEMA = {
+    'match_percentage': int,
+    'strengths': list,
+    'missing_keywords': list,
+    'recommendations': list,
+    'skills_gaps': list,
+    'overall_assessment': str,
+}
+
+# (field, heading) in rendering order, matching the free-text analysis layout
+SECTIONS = [
+    ('match_percentage', 'MATCH PERCENTAGE'),
+    ('strengths', 'KEY STRENGTHS'),
+    ('missing_keywords', 'MISSING KEYWORDS'),
+    ('recommendations', 'IMPROVEMENT RECOMMENDATIONS'),
+    ('skills_gaps', 'SKILLS GAP ANALYSIS'),
+    ('overall_assessment', 'OVERALL ASSESSMENT'),
+]
+
+MAX_ITEMS = 15
+
+CODE_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*$", re.MULTILINE)
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+SMART_QUOTES = str.maketrans({'“': '"', '”': '"', '‘': "'", '’': "'"})
+LIST_ITEM_SPLIT = re.compile(r"\s*(?:\n|;|•)\s*")
+
+
+class SchemaError(ValueError):
+    """A JSON analysis missing a field or with a field that cannot be coerced"""
+
+
+def _percentage(value):
+    if isinstance(value, bool):
+        raise SchemaError("match_percentage must be a number")
+    if isinstance(value, str):
+        number = re.search(r"\d+(?:\.\d+)?", value)
+        if number is None:
+            raise SchemaError(f"match_percentage is not a number: {value!r}")
+        value = number.group()
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise SchemaError(f"match_percentage is not a number: {value!r}")
+    return int(round(min(100.0, max(0.0, value))))
+
+
+def _items(field, value):
+    if isinstance(value, str):
+        value = LIST_ITEM_SPLIT.split(value)
+    if not isinstance(value, list):
+        raise SchemaError(f"{field} must be a list of strings")
+    items = []
+    for item in value:
+        if isinstance(item, dict):
+            # e.g. {"skill": "...", "suggestion": "..."}: keep the values in order
+            item = ' - '.join(str(part) for part in item.values() if part)
+        item = str(item).strip().lstrip('-*').strip()
+        if item and item not in items:
+            items.append(item)
+    return items[:MAX_ITEMS]
+
+
+def validate(data):
+    """The analysis coerced to SCHEMA; raises SchemaError when it does not fit"""
+    if not isinstance(data, dict):
+        raise SchemaError("the analysis must be a JSON object")
+    missing = [field for field in SCHEMA if field not in data]
+    if missing:
+        raise SchemaError(f"missing fields: {', '.join(missing)}")
+    analysis = {}
+    for field, kind in SCHEMA.items():
+        value = data[field]
+        if kind is int:
+            analysis[field] = _percentage(value)
+        elif kind is list:
+            analysis[field] = _items(field, value)
+        else:
+            analysis[field] = ' '.join(value) if isinstance(value, list) else str(value).strip()
+    return analysis
+
+
+def repair(text):
+    """Best-effort JSON text from a model response wrapped in fences or prose"""
+    text = CODE_FENCE.sub('', text.translate(SMART_QUOTES))
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end <= start:
+        return text
+    return TRAILING_COMMA.sub(r"\1", text[start:end + 1])
+
+
+def _parse(text):
+    """(analysis, repaired); raises ValueError or TypeError when the text cannot be parsed"""
+    try:
+        return validate(json.loads(text)), False
+    except (ValueError, TypeError):
+        return validate(json.loads(repair(text))), True
+
+
+def parse_analysis(text):
+    """Validated analysis dict from a model response, or None when it cannot be parsed"""
+    try:
+        analysis, repaired = _parse(text)
+    except (ValueError, TypeError) as e:
+        metrics.increment('structured.failed')
+        print(f"Error parsing structured analysis: {e}")
+        return None
+    if repaired:
+        metrics.increment('structured.repaired')
+    return analysis
+
+
+def is_valid(text):
+    """Whether a model response parses into a valid analysis (used before caching it)"""
+    try:
+        _parse(text)
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+def dumps(analysis):
+    """Compact JSON for storage"""
+    return json.dumps(analysis, separators=(',', ':'), ensure_ascii=False)
+
+
+def to_markdown(analysis):
+    """The analysis in the same layout as the free-text analysis"""
+    parts = []
+    for field, heading in SECTIONS:
+        value = analysis[field]
+        if field == 'match_percentage':
+            parts.append(f"**{heading}:** {value}%")
+        elif isinstance(value, list):
+            parts.append(f"**{heading}:**\n" + '\n'.join(f"• {item}" for item in value))
+        else:
+            parts.append(f"**{heading}:**\n{value}")
+    return '\n\n'.join(parts)
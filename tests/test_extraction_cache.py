@@ -0,0 +1,27 @@
+import io
+
+import app_config
+import extraction_cache
+from extraction_cache import IncompleteText
+
+
+def test_key_changes_with_the_extraction_settings(monkeypatch):
+    key = extraction_cache.content_key(b'%PDF', 'pdf')
+    monkeypatch.setattr(app_config, 'OCR_LANG', 'deu')
+    assert extraction_cache.content_key(b'%PDF', 'pdf') != key
+    assert extraction_cache.content_key(b'PK', 'docx') == extraction_cache.content_key(b'PK', 'docx')
+
+
+def test_incomplete_extractions_are_not_cached(tmp_path, monkeypatch):
+    cache = extraction_cache.ExtractionCache(str(tmp_path))
+    monkeypatch.setattr(extraction_cache, 'extraction_cache', cache)
+    calls = []
+
+    @extraction_cache.cached_extraction('pdf')
+    def extract(file):
+        calls.append(file)
+        return IncompleteText("page one text")
+
+    assert extract(io.BytesIO(b'%PDF-1.4 scanned')) == "page one text"
+    assert extract(io.BytesIO(b'%PDF-1.4 scanned')) == "page one text"
+    assert len(calls) == 2
@@ -0,0 +1,22 @@
+import io
+
+from PIL import Image
+
+from image_preprocess import preprocess_image
+
+
+def _jpeg(size, dpi):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'white').save(buffer, format='JPEG', dpi=(dpi, dpi))
+    buffer.seek(0)
+    return Image.open(buffer)
+
+
+def test_high_dpi_jpeg_is_scaled_to_the_target_dpi_once():
+    image = preprocess_image(_jpeg((5100, 6600), 600), target_dpi=300, binarize=False, deskew=False)
+    assert image.size == (2550, 3300)
+
+
+def test_image_at_target_dpi_keeps_its_size():
+    image = preprocess_image(_jpeg((1275, 1650), 150), target_dpi=300, binarize=False, deskew=False)
+    assert image.size == (1275, 1650)
@@ -0,0 +1,26 @@
+import pytest
+
+import keyword_ranking
+import scoring_model
+from text_processing import is_term
+
+
+@pytest.fixture
+def hashing_model(monkeypatch):
+    # The default install ships no IDF model
+    monkeypatch.setattr(scoring_model, '_model', scoring_model.HashingScoringModel())
+
+
+def test_skills_rank_first_without_an_idf_model(hashing_model):
+    jd = ("We need 5-7 years of experience. Experience with Kubernetes is a plus, "
+          "and we need experience with Terraform and PostgreSQL.")
+    resume = "Python developer"
+    ranked = [keyword for keyword, _ in keyword_ranking.rank_missing_keywords(jd, resume, k=3)]
+    assert set(ranked) == {'Kubernetes', 'Terraform', 'PostgreSQL'}
+
+
+def test_numbers_and_ranges_are_not_terms():
+    for token in ['5', '5-7', '3.5', '10+', '2024']:
+        assert not is_term(token)
+    for token in ['c++', 'c#', 's3', 'node.js', 'k8s']:
+        assert is_term(token)
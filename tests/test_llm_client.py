@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+import llm_client
+from llm_backends import StubBackend
+
+
+def _stub(name, latency, error_rate=0.0):
+    return StubBackend(name, latency_median=latency, latency_sigma=0, chunk_delay=0, error_rate=error_rate, seed=3)
+
+
+def test_waiting_for_a_slot_is_bounded_by_the_deadline():
+    client = llm_client.AsyncLLMClient(max_concurrency=1)
+    busy = client.submit(_stub('slow', 1.0), 'slow')
+    time.sleep(0.05)
+    started = time.monotonic()
+    with pytest.raises(llm_client.DeadlineExceededError):
+        client.submit(_stub('fast', 0.0), 'fast', deadline=time.monotonic() + 0.2).result()
+    assert time.monotonic() - started < 0.6
+    assert busy.result()
+
+
+def test_retries_take_rate_limit_capacity():
+    client = llm_client.AsyncLLMClient(requests_per_minute=600, max_retries=10, base_delay=0.001)
+    retries_before = llm_client.metrics.count('llm.retries')
+    assert client.submit(_stub('flaky', 0.0, error_rate=0.5), 'flaky').result()
+    retries = llm_client.metrics.count('llm.retries') - retries_before
+    assert retries > 0
+    # One request token per attempt; the bucket refills 10 per second meanwhile
+    assert client._requests.tokens <= 600 - (1 + retries) + 1
+
+
+def test_request_arriving_after_a_call_landed_is_served_from_the_cache(tmp_path, monkeypatch):
+    cache = llm_client.response_cache.ResponseCache(str(tmp_path / 'responses.sqlite3'))
+    monkeypatch.setattr(llm_client.response_cache, 'get_response_cache', lambda: cache)
+
+    class Unreachable:
+        name = 'unreachable'
+
+        def generate_content(self, prompt, stream=False, request_options=None):
+            raise AssertionError("the model must not be called again")
+
+    # The caller's own lookup missed; the call then landed and left the in-flight table
+    cache.set('key', 'answer')
+    flight, joined, cache_hit = llm_client._join_or_start(Unreachable(), 'prompt', 'key', False, None)
+    assert (joined, cache_hit) == (False, True)
+    assert ''.join(flight.read()) == 'answer'
+
+
+def test_rejected_responses_are_not_cached(tmp_path, monkeypatch):
+    cache = llm_client.response_cache.ResponseCache(str(tmp_path / 'responses.sqlite3'))
+    monkeypatch.setattr(llm_client.response_cache, 'get_response_cache', lambda: cache)
+    model = _stub('plain', 0.0)
+
+    response = llm_client.StreamedResponse(model, 'prompt', 'rejected', stream=False,
+                                           validate=lambda text: text.startswith('{'))
+    assert ''.join(response)
+    assert cache.get('rejected') is None
+
+    # An invalid entry cached earlier is not replayed either
+    cache.set('stale', 'not json')
+    response = llm_client.StreamedResponse(model, 'prompt', 'stale', stream=False,
+                                           validate=lambda text: text.startswith('{'))
+    assert ''.join(response) != 'not json'
+    assert not response.cache_hit
@@ -0,0 +1,31 @@
+import numpy as np
+
+import near_duplicates
+
+
+def _pair(rng, jaccard, size=300):
+    """Two documents of distinct single-token shingles with the given Jaccard similarity"""
+    shared = int(round(2 * size * jaccard / (1 + jaccard)))
+    words = [f"w{i}" for i in rng.choice(10 ** 6, 2 * size - shared, replace=False)]
+    first = words[:size]
+    second = words[:shared] + words[size:]
+    return ' '.join(first), ' '.join(second)
+
+
+def test_minhash_estimate_error_matches_theory():
+    rng = np.random.default_rng(0)
+    hasher = near_duplicates.MinHasher(128)
+    jaccard = 0.6
+    errors = []
+    for _ in range(100):
+        first, second = _pair(rng, jaccard)
+        first_set = set(near_duplicates.shingle_hashes(first, 1).tolist())
+        second_set = set(near_duplicates.shingle_hashes(second, 1).tolist())
+        true_jaccard = len(first_set & second_set) / len(first_set | second_set)
+        estimate = near_duplicates.estimated_jaccard(hasher.signature(first, 1), hasher.signature(second, 1))
+        errors.append(estimate - true_jaccard)
+    errors = np.array(errors)
+    expected_std = np.sqrt(jaccard * (1 - jaccard) / 128)
+    assert abs(errors.mean()) < 0.02
+    assert errors.std() < 1.5 * expected_std
+    assert (errors + jaccard < 0.85).all()
@@ -0,0 +1,51 @@
+import prompt_compaction
+
+
+def test_unmarked_benefits_line_keeps_the_requirements_after_it():
+    jd = (
+        "Senior Python Engineer\n"
+        "Great benefits\n"
+        "We need Python, Kubernetes and AWS experience.\n"
+        "Salary range competitive\n"
+        "Must know Terraform and Go."
+    )
+    compacted = prompt_compaction.compact_text(jd, budget=1000, drop_boilerplate=True).text
+    assert "We need Python, Kubernetes and AWS experience." in compacted
+    assert "Must know Terraform and Go." in compacted
+
+
+def test_marked_benefits_section_is_dropped():
+    jd = "Requirements:\nPython and SQL\nBenefits:\nFree lunch\n## Perks\nGym membership"
+    compacted = prompt_compaction.compact_text(jd, drop_boilerplate=True).text
+    assert compacted.splitlines() == ["Requirements:", "Python and SQL"]
+
+
+def test_requirement_lines_are_not_boilerplate():
+    jd = (
+        "Applicants must be proficient in Go and SQL.\n"
+        "Must pass a background check.\n"
+        "We are an equal opportunity employer and value diversity."
+    )
+    compacted = prompt_compaction.compact_text(jd, drop_boilerplate=True).text
+    assert compacted.splitlines() == [
+        "Applicants must be proficient in Go and SQL.",
+        "Must pass a background check.",
+    ]
+
+
+def test_short_skill_lines_are_not_ocr_noise():
+    resume = "SKILLS\nC++\nC#\nR\nPython\n|||\n~ ~ ._"
+    compacted = prompt_compaction.compact_text(resume).text
+    assert compacted.splitlines() == ["SKILLS", "C++", "C#", "R", "Python"]
+
+
+def test_repeated_short_job_titles_are_kept():
+    resume = (
+        "Software Engineer\nAcme Corp, 2019-2021\n"
+        "Software Engineer\nGlobex, 2021-2024\n"
+        "Jane Doe - jane.doe@example.com - +1 555 0100 - page footer\n"
+        "Jane Doe - jane.doe@example.com - +1 555 0100 - page footer"
+    )
+    lines = prompt_compaction.compact_text(resume).text.splitlines()
+    assert lines.count("Software Engineer") == 2
+    assert len(lines) == 5
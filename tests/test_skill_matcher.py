@@ -0,0 +1,23 @@
+import skill_matcher
+
+
+def test_alias_does_not_also_report_a_skill_inside_it():
+    counts = skill_matcher.match_skills("Five years of C sharp and Spring Boot development").counts
+    assert counts['C#'] == 1
+    assert counts['Spring Boot'] == 1
+    assert 'C' not in counts
+    assert 'Spring' not in counts
+
+
+def test_standalone_shorter_skill_is_still_reported():
+    counts = skill_matcher.match_skills("C sharp, plus embedded C and Spring").counts
+    assert counts['C#'] == 1
+    assert counts['C'] == 1
+    assert counts['Spring'] == 1
+
+
+def test_ambiguous_short_skills_match_only_as_written():
+    counts = skill_matcher.match_skills("You will go above and beyond with our r&d team, plan c if needed").counts
+    assert not {'Go', 'C', 'R'} & set(counts)
+    counts = skill_matcher.match_skills("Go, C and R; also golang").counts
+    assert (counts['Go'], counts['C'], counts['R']) == (2, 1, 1)
@@ -0,0 +1,80 @@
+"""Shared normalization and tokenization for resumes and job descriptions.
+
+Every document is analyzed once and the resulting ``AnalyzedText`` is reused
+by match scoring, keyword analysis, the charts and the resume index, so all of
+them agree on what a term is.
+"""
+import re
+import unicodedata
+import functools
+from collections import Counter, namedtuple
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Technical terms such as "c++", "c#", "node.js", "ci-cd" stay whole;
+# surrounding punctuation is dropped.
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-_][a-z0-9+#]+)*")
+
+CASED_TOKEN_PATTERN = re.compile(TOKEN_PATTERN.pattern, re.IGNORECASE)
+
+# Stop words that are also parts of common skill names. Single letters and "go"
+# stay out: as plain words they are mostly noise ("plan C", "R&D", "go above"),
+# and the skill dictionary recognises "C", "R" and "Go" by their capitalisation.
+KEEP_TERMS = frozenset({'system', 'back', 'front', 'full'})
+STOP_WORDS = frozenset(ENGLISH_STOP_WORDS) - KEEP_TERMS
+# Numbers, ranges and versions without letters: "5", "5-7", "3.5", "10+"
+NUMERIC_TOKEN = re.compile(r"[0-9.\-_+#]+")
+
+AnalyzedText = namedtuple('AnalyzedText', ['text', 'tokens', 'terms', 'counts'])
+AnalyzedText.__doc__ = """Result of analyzing one document
+
+text   -- the original text
+tokens -- every normalized token in order (used for phrase matching)
+terms  -- tokens that carry meaning: no stop words, numbers or ranges
+counts -- Counter of terms, in first-occurrence order
+"""
+
+
+def normalize_text(text):
+    """Unicode-normalize (NFKC) and case-fold a document"""
+    return unicodedata.normalize('NFKC', text).casefold()
+
+
+def tokenize(text):
+    """All tokens of a text after normalization"""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def cased_tokens(text):
+    """Tokens of a text in their original case, aligned with tokenize(text), or None
+
+    None when case folding changes the tokenization (e.g. "ß" -> "ss").
+    """
+    cased = CASED_TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text))
+    return cased if [token.casefold() for token in cased] == tokenize(text) else None
+
+
+def is_term(token):
+    if token in STOP_WORDS or NUMERIC_TOKEN.fullmatch(token):
+        return False
+    return len(token) > 1
+
+
+def extract_terms(text):
+    """Meaningful terms of a text, without caching (used for corpus builds)"""
+    return [token for token in tokenize(text) if is_term(token)]
+
+
+@functools.lru_cache(maxsize=64)
+def analyze_text(text):
+    """Analyze a document once; repeated calls with the same text are free"""
+    tokens = tuple(tokenize(text))
+    terms = tuple(token for token in tokens if is_term(token))
+    return AnalyzedText(text, tokens, terms, Counter(terms))
+
+
+def as_analyzed(document):
+    """Accept raw text or an AnalyzedText and return an AnalyzedText"""
+    if isinstance(document, AnalyzedText):
+        return document
+    return analyze_text(document)